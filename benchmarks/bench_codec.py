@@ -0,0 +1,87 @@
+"""
+Micro-benchmark of per-item Data* serialization.
+
+For each of the ten data types this times:
+  - to_bytes()               (allocates a new bytes object per call)
+  - write_into(buf, offset)  (packs into a reused bytearray)
+
+Pass --baseline PATH to also time to_bytes() from another checkout of the package
+(e.g. `git worktree add /tmp/cbp-old <rev>`), which shows the gain over that revision.
+
+Usage:
+    python benchmarks/bench_codec.py [--number N] [--baseline PATH]
+"""
+import argparse
+import functools
+import importlib
+import os
+import sys
+import timeit
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def make_items(m):
+    """One representative instance of every data type, built from package module ``m``."""
+    return {
+        'DataNull': m.DataNull(),
+        'DataKv': m.DataKv({'server': 'udp-eu.tartabit.com:10106', 'interval': '300', 'readings': '60'}),
+        'DataLocation(gnss)': m.DataLocation.gnss(52.520008, 13.404954),
+        'DataLocation(cell)': m.DataLocation.cell('262', '01', '1A2B', '0C4D5E6F', -71),
+        'DataCustomerId': m.DataCustomerId('0a1b2c3d4e5f'),
+        'DataVersions': m.DataVersions('1.4.2', 'BG95M3LAR02A03'),
+        'DataNetworkInfo': m.DataNetworkInfo('262', '01', 'LTE-M'),
+        'DataDeviceStatus': m.DataDeviceStatus(87, 24),
+        'DataEnvironment': m.DataEnvironment(21.5, 40.5, 320, True),
+        'DataMulti(60)': m.DataMulti(1724900000, 60, [
+            {'temperature': 20.0 + (i % 50) / 10, 'humidity': 45.0 - (i % 30) / 10} for i in range(60)
+        ]),
+        'DataSteps': m.DataSteps(12345),
+    }
+
+
+def load_package(path):
+    """Import compact_binary_protocol from ``path``, isolated from any copy already imported."""
+    for name in list(sys.modules):
+        if name == 'compact_binary_protocol' or name.startswith('compact_binary_protocol.'):
+            del sys.modules[name]
+    sys.path.insert(0, path)
+    try:
+        return importlib.import_module('compact_binary_protocol')
+    finally:
+        sys.path.remove(path)
+
+
+def per_call_ns(fn, number):
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--number', type=int, default=20000, help='calls per timing run')
+    parser.add_argument('--baseline', help='path to another checkout to compare to_bytes() against')
+    args = parser.parse_args()
+
+    baseline = {}
+    if args.baseline:
+        old = load_package(os.path.abspath(args.baseline))
+        baseline = {name: per_call_ns(item.to_bytes, args.number) for name, item in make_items(old).items()}
+
+    cur = load_package(REPO_ROOT)
+    buf = bytearray(4096)
+    header = f"{'item':<20} {'to_bytes ns':>12} {'write_into ns':>14}"
+    if baseline:
+        header += f" {'baseline ns':>12} {'gain':>7}"
+    print(header)
+    for name, item in make_items(cur).items():
+        to_bytes_ns = per_call_ns(item.to_bytes, args.number)
+        write_ns = per_call_ns(functools.partial(item.write_into, buf, 0), args.number)
+        line = f"{name:<20} {to_bytes_ns:>12.0f} {write_ns:>14.0f}"
+        if baseline:
+            base_ns = baseline[name]
+            line += f" {base_ns:>12.0f} {base_ns / min(to_bytes_ns, write_ns):>6.2f}x"
+        print(line)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+"""
+Memory footprint of decoded telemetry held in memory.
+
+Builds N packets of each kind and reports the bytes retained per packet (tracemalloc,
+packet objects plus their Data items, excluding the wire bytes):
+  - multi:   TelemetryPacket with DataMulti(60 records), DataDeviceStatus, DataLocation(gnss)
+  - env:     TelemetryPacket with DataEnvironment, DataSteps
+  - startup: TelemetryPacket with DataCustomerId, DataVersions, DataNetworkInfo
+
+"built" constructs the objects directly (works on any revision); "decoded" runs decode_packet()
+on the encoded packets, when the package has it. Pass --baseline PATH to compare against
+another checkout (e.g. `git worktree add /tmp/cbp-old <rev>`).
+
+Usage:
+    python benchmarks/bench_memory.py [--packets N] [--baseline PATH]
+"""
+import argparse
+import gc
+import os
+import tracemalloc
+
+from bench_codec import REPO_ROOT, load_package
+
+IMEI = '358419511056392'
+
+
+def make_packets(m, n):
+    """``n`` packets of each kind, built with the classes of package module ``m``."""
+    multi, env, startup = [], [], []
+    for i in range(n):
+        ts = 1724900000 + i
+        records = [{'temperature': 20.0 + (j % 50) / 10, 'humidity': 45.0 - (j % 30) / 10} for j in range(60)]
+        multi.append(m.TelemetryPacket(IMEI, ts, i & 0xFFFF, 'T', [
+            m.DataMulti(ts - 3600, 60, records),
+            m.DataDeviceStatus(87, 24),
+            m.DataLocation.gnss(52.520008, 13.404954),
+        ]))
+        env.append(m.TelemetryPacket(IMEI, ts, i & 0xFFFF, 'T', [
+            m.DataEnvironment(21.5, 40.5, 320, True),
+            m.DataSteps(12345 + i),
+        ]))
+        startup.append(m.TelemetryPacket(IMEI, ts, i & 0xFFFF, 'T', [
+            m.DataCustomerId('0a1b2c3d4e5f'),
+            m.DataVersions('1.4.2', 'BG95M3LAR02A03'),
+            m.DataNetworkInfo('262', '01', 'LTE-M'),
+        ]))
+    return {'multi': multi, 'env': env, 'startup': startup}
+
+
+def retained_bytes(factory, n):
+    """Bytes still allocated per item after ``factory()`` returns a list of ``n`` items."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = factory()
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del kept
+    return (after - before) / n
+
+
+def measure(m, n):
+    results = {}
+    for kind in ('multi', 'env', 'startup'):
+        results[(kind, 'built')] = retained_bytes(lambda: make_packets(m, n)[kind], n)
+    decode = getattr(m, 'decode_packet', None)
+    if decode is not None:
+        for kind, packets in make_packets(m, n).items():
+            wire = [p.to_bytes() for p in packets]
+            results[(kind, 'decoded')] = retained_bytes(lambda: [decode(b) for b in wire], n)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--packets', type=int, default=2000, help='packets per kind')
+    parser.add_argument('--baseline', help='path to another checkout to compare against')
+    args = parser.parse_args()
+
+    baseline = measure(load_package(os.path.abspath(args.baseline)), args.packets) if args.baseline else {}
+    current = measure(load_package(REPO_ROOT), args.packets)
+
+    header = f"{'packet':<10} {'path':<8} {'bytes/packet':>13}"
+    if baseline:
+        header += f" {'baseline':>10} {'saved':>7}"
+    print(header)
+    for (kind, path), size in current.items():
+        line = f"{kind:<10} {path:<8} {size:>13.0f}"
+        base = baseline.get((kind, path))
+        if base is not None:
+            line += f" {base:>10.0f} {1 - size / base:>6.0%}"
+        print(line)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,202 @@
+"""
+Benchmark suite: encode, decode and loopback UDP throughput, with JSON output.
+
+Benchmarks (fixtures in fixtures.py):
+  - to_bytes[<item>]                      every Data* type, plus a 255-record DataMulti
+  - TelemetryPacket.to_bytes[<packet>]    multi255, startup, env, config packets
+  - Packet._encode_imei_bcd[...]          one device (cache hit) and 100k devices cycling
+  - DataReader.read_data_items[<packet>]  item splitting of each packet body
+  - DataReader.parse_kv_payload           a 5-pair config payload
+  - decode_packet[<packet>]               full decode (when the package has decode_packet)
+  - udp.roundtrip                         client -> CompactBinaryServer -> Ack over loopback,
+                                          64 packets in flight (when the package has the server)
+
+Each benchmark is calibrated to run at least --min-time seconds per run; the median of
+--runs runs is reported in ns per operation. Benchmarks missing from a checkout are skipped.
+
+Usage:
+    python benchmarks/bench_suite.py --json new.json
+    python benchmarks/bench_suite.py --package /tmp/cbp-old --json old.json
+    python benchmarks/bench_suite.py --compare old.json new.json
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import timeit
+
+from bench_codec import REPO_ROOT, load_package, make_items
+from fixtures import IMEI, config_pairs, multi_255, telemetry_packets
+
+
+def benchmarks(m):
+    """name -> zero-argument callable, for everything package ``m`` supports."""
+    cases = {}
+    items = make_items(m)
+    items['DataMulti(255)'] = multi_255(m)
+    for name, item in items.items():
+        cases[f'to_bytes[{name}]'] = item.to_bytes
+
+    packets = telemetry_packets(m)
+    for name, packet in packets.items():
+        cases[f'TelemetryPacket.to_bytes[{name}]'] = packet.to_bytes
+
+    encode_imei = m.Packet._encode_imei_bcd
+    cases['Packet._encode_imei_bcd[1 device]'] = lambda: encode_imei(IMEI)
+    imeis = itertools.cycle([f'35841951{i:07d}' for i in range(100000)])
+    cases['Packet._encode_imei_bcd[100k devices]'] = lambda: encode_imei(next(imeis))
+
+    reader = m.DataReader
+    for name, packet in packets.items():
+        body = packet.to_bytes()[len(packet.build_header()):]
+        cases[f'DataReader.read_data_items[{name}]'] = lambda body=body: reader(body).read_data_items()
+    kv_payload = m.DataKv(config_pairs()).to_bytes()[4:]
+    cases['DataReader.parse_kv_payload'] = lambda: reader.parse_kv_payload(kv_payload)
+
+    decode = getattr(m, 'decode_packet', None)
+    if decode is not None:
+        for name, packet in packets.items():
+            wire = packet.to_bytes()
+            cases[f'decode_packet[{name}]'] = lambda wire=wire: decode(wire)
+    return cases
+
+
+def time_callable(fn, runs, min_time):
+    """ns per call for each of ``runs`` runs, each at least ``min_time`` seconds long."""
+    number = 1
+    while timeit.timeit(fn, number=number) < min_time:
+        number *= 2
+    return [t / number * 1e9 for t in timeit.repeat(fn, number=number, repeat=runs)]
+
+
+def udp_roundtrip(m, runs, min_time, window=64):
+    """ns per packet for send -> decode -> Ack -> receive over loopback, or None if unsupported."""
+    server_class = getattr(m, 'CompactBinaryServer', None)
+    if server_class is None:
+        return None
+    wire = telemetry_packets(m)['env'].to_bytes()
+
+    class Client(asyncio.DatagramProtocol):
+        def __init__(self):
+            self.pending = 0
+            self.done = None
+
+        def datagram_received(self, data, addr):
+            self.pending -= 1
+            if self.pending == 0:
+                self.done.set_result(None)
+
+    async def handler(packet, addr):
+        pass
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        async with server_class(handler, host='127.0.0.1', port=0) as server:
+            transport, client = await loop.create_datagram_endpoint(Client, remote_addr=server.local_address[:2])
+            try:
+                async def burst():
+                    client.pending = window
+                    client.done = loop.create_future()
+                    for _ in range(window):
+                        transport.sendto(wire)
+                    await asyncio.wait_for(client.done, 5.0)
+
+                await burst()  # warm-up
+                results = []
+                for _ in range(runs):
+                    count = 0
+                    start = time.perf_counter()
+                    while time.perf_counter() - start < min_time:
+                        await burst()
+                        count += window
+                    results.append((time.perf_counter() - start) / count * 1e9)
+                return results
+            finally:
+                transport.close()
+
+    return asyncio.run(run())
+
+
+def git_revision(path):
+    try:
+        return subprocess.run(['git', '-C', path, 'rev-parse', '--short', 'HEAD'],
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_suite(path, runs, min_time, pattern=None):
+    m = load_package(path)
+    results = {}
+    cases = benchmarks(m)
+    cases['udp.roundtrip'] = None
+    for name, fn in cases.items():
+        if pattern and pattern not in name:
+            continue
+        samples = udp_roundtrip(m, runs, min_time) if fn is None else time_callable(fn, runs, min_time)
+        if samples is None:
+            continue
+        results[name] = {
+            'ns_per_op': statistics.median(samples),
+            'min_ns': min(samples),
+            'stdev_ns': statistics.stdev(samples) if len(samples) > 1 else 0.0,
+            'runs': samples,
+        }
+        print(f"{name:<44} {results[name]['ns_per_op']:>12.0f} ns  "
+              f"(±{results[name]['stdev_ns']:.0f})", file=sys.stderr)
+    return {
+        'meta': {
+            'package': path,
+            'revision': git_revision(path),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'runs': runs,
+            'min_time': min_time,
+        },
+        'benchmarks': results,
+    }
+
+
+def compare(old_path, new_path):
+    with open(old_path) as f:
+        old = json.load(f)['benchmarks']
+    with open(new_path) as f:
+        new = json.load(f)['benchmarks']
+    print(f"{'benchmark':<44} {'old ns':>10} {'new ns':>10} {'change':>14}")
+    for name, result in new.items():
+        if name not in old:
+            continue
+        before, after = old[name]['ns_per_op'], result['ns_per_op']
+        ratio = before / after
+        change = f"{ratio:.2f}x" + (' faster' if ratio >= 1 else ' slower')
+        print(f"{name:<44} {before:>10.0f} {after:>10.0f} {change:>14}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--package', default=REPO_ROOT, help='checkout to benchmark (default: this one)')
+    parser.add_argument('--json', help='write results to this file')
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--min-time', type=float, default=0.1, help='seconds per run')
+    parser.add_argument('--filter', help='only run benchmarks whose name contains this')
+    parser.add_argument('--compare', nargs=2, metavar=('OLD', 'NEW'), help='compare two JSON result files')
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+    result = run_suite(os.path.abspath(args.package), args.runs, args.min_time, args.filter)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(result, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+"""
+Realistic fixtures shared by the benchmarks.
+
+Every builder takes the package module ``m`` (see bench_codec.load_package), so the same
+fixtures can be built against another checkout for comparisons.
+"""
+IMEI = '358419511056392'
+TIMESTAMP = 1724900000
+
+
+def multi_255(m):
+    """A full DataMulti: 255 samples, one per minute, with slowly varying values."""
+    records = [
+        {'temperature': 18.0 + (i % 70) / 10, 'humidity': 55.0 - (i % 40) / 10}
+        for i in range(255)
+    ]
+    return m.DataMulti(TIMESTAMP - 255 * 60, 60, records)
+
+
+def startup_items(m):
+    """Items of the Telemetry packet a device sends on power-up."""
+    return [
+        m.DataCustomerId('0a1b2c3d4e5f'),
+        m.DataVersions('1.4.2', 'BG95M3LAR02A03'),
+        m.DataNetworkInfo('262', '01', 'LTE-M'),
+    ]
+
+
+def config_pairs():
+    return {
+        'server': 'udp-eu.tartabit.com:10106',
+        'interval': '300',
+        'readings': '60',
+        'motion_threshold': '12',
+        'apn': 'iot.1nce.net',
+    }
+
+
+def telemetry_packets(m):
+    """name -> TelemetryPacket for the common packet shapes."""
+    return {
+        'multi255': m.TelemetryPacket(IMEI, TIMESTAMP, 1, 'T', [
+            multi_255(m),
+            m.DataDeviceStatus(87, 24),
+            m.DataLocation.gnss(52.520008, 13.404954),
+        ]),
+        'startup': m.TelemetryPacket(IMEI, TIMESTAMP, 2, 'T', startup_items(m)),
+        'env': m.TelemetryPacket(IMEI, TIMESTAMP, 3, 'T', [
+            m.DataEnvironment(21.5, 40.5, 320, True),
+            m.DataSteps(12345),
+            m.DataDeviceStatus(87, 24),
+        ]),
+        'config': m.TelemetryPacket(IMEI, TIMESTAMP, 4, 'T', [m.DataKv(config_pairs())]),
+    }
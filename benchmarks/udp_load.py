@@ -0,0 +1,93 @@
+"""
+Loopback UDP load test for MultiProcessServer.
+
+For each worker count from 1 to --max-workers, starts a MultiProcessServer on 127.0.0.1,
+blasts pre-encoded Telemetry packets from --senders processes (distinct source ports, so
+SO_REUSEPORT spreads them across workers) for --duration seconds, and reports how many
+decoded packets per second reached the parent process.
+
+Usage:
+    python benchmarks/udp_load.py [--max-workers N] [--senders M] [--duration S] [--batched]
+"""
+import argparse
+import multiprocessing
+import os
+import socket
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from compact_binary_protocol import TelemetryPacket, DataMulti, DataDeviceStatus  # noqa: E402
+from compact_binary_protocol.server import MultiProcessServer, BatchedCompactBinaryServer  # noqa: E402
+
+
+def _packets(sender_id, count=1024):
+    records = [{'temperature': 21.5, 'humidity': 40.0}] * 10
+    return [
+        TelemetryPacket(f"35841951{sender_id:03d}{i:04d}", 1724900000, i, 'T',
+                        [DataDeviceStatus(90, 20), DataMulti(1724900000, 60, records)]).to_bytes()
+        for i in range(count)
+    ]
+
+
+def _sender(port, sender_id, stop):
+    packets = _packets(sender_id)
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.setblocking(False)
+    addr = ('127.0.0.1', port)
+    i = 0
+    while not stop.is_set():
+        try:
+            sock.sendto(packets[i & 1023], addr)
+        except (BlockingIOError, ConnectionRefusedError):
+            time.sleep(0)
+        i += 1
+        if i & 1023 == 0:
+            # Drain acks so the sender socket buffer does not stall
+            try:
+                while sock.recv(64):
+                    pass
+            except BlockingIOError:
+                pass
+
+
+def run(workers, senders, duration, batched=False):
+    ctx = multiprocessing.get_context()
+    options = {'server_class': BatchedCompactBinaryServer} if batched else {}
+    with MultiProcessServer('127.0.0.1', 0, workers, **options) as server:
+        stop = ctx.Event()
+        procs = [ctx.Process(target=_sender, args=(server.port, n, stop), daemon=True) for n in range(senders)]
+        for p in procs:
+            p.start()
+        received = 0
+        start = time.monotonic()
+        while time.monotonic() - start < duration:
+            received += len(server.get_batch(timeout=0.1))
+        elapsed = time.monotonic() - start
+        stop.set()
+        for p in procs:
+            p.join()
+        stats = server.worker_stats
+    return received / elapsed, stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--max-workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--senders', type=int, default=4)
+    parser.add_argument('--duration', type=float, default=5.0)
+    parser.add_argument('--batched', action='store_true', help='use BatchedCompactBinaryServer in the workers')
+    args = parser.parse_args()
+
+    base = None
+    print(f"{'workers':>7} {'packets/s':>12} {'scaling':>8} {'dropped':>8}")
+    for workers in range(1, args.max_workers + 1):
+        pps, stats = run(workers, args.senders, args.duration, args.batched)
+        base = base or pps
+        dropped = sum(s['dropped'] for s in stats.values())
+        print(f"{workers:>7} {pps:>12.0f} {pps / base:>7.2f}x {dropped:>8}")
+
+
+if __name__ == '__main__':
+    main()
@@ -7,12 +7,16 @@ used by Tartabit client components. It provides:
 - Data model classes for location and sensor data
 - Packet classes for telemetry/configuration/power/motion events
 - Decoding helpers for responses and header parsing
+- An asyncio UDP server with automatic acknowledgments and a device-side client
 
 All multi-byte values are encoded using big-endian format.
 """
 
 from .encodings import encode_var_string
-from .decoders import PacketDecoder, DataReader
+from .decoders import (
+    PacketDecoder, DataReader, decode_packet, decode_batch, PacketView, parse_header, build_ack,
+    register_data_type,
+)
 from .data import (
     DataLocation,
     DataEnvironment,
@@ -24,12 +28,17 @@ from .data import (
     DataCustomerId,
     DataDeviceStatus,
     DataKv,
+    DataRaw,
 )
-from .packets import Packet, TelemetryPacket, ConfigPacket
+from .packets import Packet, TelemetryPacket, ConfigPacket, RawPacket, AckPacket
+from .server import CompactBinaryServer
+from .client import ClientPool, DeviceSession
 
 __all__ = [
     'encode_var_string',
-    'PacketDecoder', 'DataReader',
-    'DataLocation', 'DataEnvironment', 'DataMulti', 'DataNull', 'DataSteps', 'DataVersions', 'DataNetworkInfo', 'DataCustomerId', 'DataKv', 'DataDeviceStatus',
-    'Packet', 'TelemetryPacket', 'ConfigPacket',
+    'PacketDecoder', 'DataReader', 'decode_packet', 'decode_batch', 'PacketView', 'parse_header', 'build_ack',
+    'register_data_type',
+    'DataLocation', 'DataEnvironment', 'DataMulti', 'DataNull', 'DataSteps', 'DataVersions', 'DataNetworkInfo', 'DataCustomerId', 'DataKv', 'DataDeviceStatus', 'DataRaw',
+    'Packet', 'TelemetryPacket', 'ConfigPacket', 'RawPacket', 'AckPacket',
+    'CompactBinaryServer', 'ClientPool', 'DeviceSession',
 ]
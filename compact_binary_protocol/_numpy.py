@@ -0,0 +1,16 @@
+# Optional NumPy support. numpy is not a hard dependency; features that need it call
+# require_numpy(), which raises a helpful ImportError when it is not installed.
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - depends on the environment
+    np = None
+
+
+def require_numpy():
+    if np is None:
+        raise ImportError(
+            "numpy is required for this feature; install it with "
+            "'pip install compact-binary-protocol[numpy]'"
+        )
+    return np
@@ -0,0 +1,8 @@
+from .format import CaptureRecord
+from .reader import iter_capture, iter_pcap, iter_records, iter_packets
+from .writer import CaptureWriter, read_index, seek_offset, seek_imei
+
+__all__ = [
+    'CaptureRecord', 'iter_capture', 'iter_pcap', 'iter_records', 'iter_packets',
+    'CaptureWriter', 'read_index', 'seek_offset', 'seek_imei',
+]
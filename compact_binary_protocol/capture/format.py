@@ -0,0 +1,100 @@
+"""
+Capture file format for raw datagrams (".cbpc").
+
+File header (8 bytes):
+  - magic: b'CBPC'
+  - version: u8 (currently 1)
+  - reserved: 3 bytes (zero)
+
+Then records, back to back:
+  - length: u32 — number of datagram bytes
+  - timestamp: u64 — receive time in microseconds since the Unix epoch (0 if unknown)
+  - addr_len: u8 — 0 (no address), 4 (IPv4) or 16 (IPv6)
+  - addr: addr_len bytes, followed by port u16 when addr_len > 0
+  - data: length bytes (the raw UDP payload)
+
+Index file (".cbpc.idx", optional, written next to a segment; every Nth record plus the
+first record of each IMEI in the segment):
+  - magic: b'CBPI', version u8, reserved 3 bytes
+  - entries: timestamp u64 (µs), imei_hash u32 (CRC-32 of the packed-BCD IMEI, 0 if unknown),
+    offset u64 (byte offset of the record in the segment)
+
+All multi-byte values are big-endian.
+"""
+import socket
+import struct
+import zlib
+from functools import lru_cache
+
+MAGIC = b'CBPC'
+FORMAT_VERSION = 1
+FILE_HEADER = struct.Struct('>4sB3x')
+RECORD_HEADER = struct.Struct('>IQB')
+PORT = struct.Struct('>H')
+_LENGTH_TIMESTAMP = struct.Struct('>IQ')
+
+INDEX_MAGIC = b'CBPI'
+INDEX_ENTRY = struct.Struct('>QIQ')
+
+
+class CaptureRecord:
+    """One captured datagram: receive time (float seconds or None), source (host, port) or None, and data."""
+    __slots__ = ('timestamp', 'addr', 'data')
+
+    def __init__(self, timestamp, addr, data):
+        self.timestamp = timestamp
+        self.addr = addr
+        self.data = data
+
+    def __repr__(self):
+        return f"CaptureRecord(timestamp={self.timestamp}, addr={self.addr}, len={len(self.data)})"
+
+
+def pack_addr(addr) -> bytes:
+    """Encode a (host, port) socket address as addr_len + addr + port; None encodes as b'\\x00'."""
+    if addr is None:
+        return b'\x00'
+    return _pack_host_port(addr[0], addr[1])
+
+
+@lru_cache(maxsize=65536)
+def _pack_host_port(host, port):
+    family = socket.AF_INET6 if ':' in host else socket.AF_INET
+    raw = socket.inet_pton(family, host)
+    return bytes((len(raw),)) + raw + PORT.pack(port)
+
+
+def pack_record_header(length: int, timestamp_us: int, addr) -> bytes:
+    return _LENGTH_TIMESTAMP.pack(length, timestamp_us) + pack_addr(addr)
+
+
+def imei_hash(data) -> int:
+    """CRC-32 of the packed-BCD IMEI in a raw packet header, or 0 if the header is too short."""
+    if len(data) < 6:
+        return 0
+    end = 6 + data[5]
+    if end > len(data):
+        return 0
+    return zlib.crc32(data[6:end])
+
+
+def unpack_addr(buf, offset: int, addr_len: int):
+    """Decode the address that follows a record header; returns ((host, port) or None, next_offset)."""
+    if addr_len == 0:
+        return None, offset
+    if addr_len == 4:
+        family = socket.AF_INET
+    elif addr_len == 16:
+        family = socket.AF_INET6
+    else:
+        raise ValueError(f"Invalid address length {addr_len}")
+    end = offset + addr_len
+    host = socket.inet_ntop(family, bytes(buf[offset:end]))
+    port, = PORT.unpack_from(buf, end)
+    return (host, port), end + PORT.size
+
+
+__all__ = [
+    'MAGIC', 'FORMAT_VERSION', 'FILE_HEADER', 'RECORD_HEADER', 'INDEX_MAGIC', 'INDEX_ENTRY',
+    'CaptureRecord', 'pack_addr', 'unpack_addr', 'pack_record_header', 'imei_hash',
+]
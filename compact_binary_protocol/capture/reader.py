@@ -0,0 +1,204 @@
+"""
+Streaming readers for capture files.
+
+Files are memory-mapped and walked record by record; each record's data is a memoryview
+into the mapping, so multi-GB captures are processed in constant memory without being read
+whole. The views stay valid while the generator is open; copy them (bytes(record.data)) to
+keep them longer. Decoded packets do not reference the mapping.
+"""
+import mmap
+import socket
+import struct
+
+from ..decoders import decode_packet
+from .format import MAGIC, FILE_HEADER, RECORD_HEADER, PORT, CaptureRecord, unpack_addr
+
+# ---- pcap (classic libpcap format) ----
+_PCAP_MAGIC = {
+    b'\xd4\xc3\xb2\xa1': ('<', 1e-6),
+    b'\xa1\xb2\xc3\xd4': ('>', 1e-6),
+    b'\x4d\x3c\xb2\xa1': ('<', 1e-9),
+    b'\xa1\xb2\x3c\x4d': ('>', 1e-9),
+}
+_PCAPNG_MAGIC = b'\x0a\x0d\x0d\x0a'
+
+LINKTYPE_NULL = 0
+LINKTYPE_ETHERNET = 1
+LINKTYPE_RAW = 101
+LINKTYPE_LINUX_SLL = 113
+LINKTYPE_LINUX_SLL2 = 276
+
+_ETH_IPV4 = 0x0800
+_ETH_IPV6 = 0x86DD
+_ETH_VLAN = (0x8100, 0x88A8)
+_IPPROTO_UDP = 17
+_U16 = struct.Struct('>H')
+_UDP = struct.Struct('>HHH')
+
+
+def _open_mmap(path):
+    with open(path, 'rb') as f:
+        if f.seek(0, 2) == 0:
+            return None
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def _close_mmap(mm, mv):
+    mv.release()
+    try:
+        mm.close()
+    except BufferError:
+        # The caller still holds record views; the mapping is closed when they are released
+        pass
+
+
+def iter_capture(path, offset: int | None = None):
+    """
+    Yield CaptureRecord for every datagram in a .cbpc capture file (see capture.format).
+    ``offset`` starts at a record boundary, e.g. one taken from the segment index.
+    """
+    mm = _open_mmap(path)
+    if mm is None:
+        return
+    mv = memoryview(mm)
+    try:
+        if len(mv) < FILE_HEADER.size:
+            return  # file header not fully written yet
+        magic, version = FILE_HEADER.unpack_from(mv, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a capture file")
+        if version != 1:
+            raise ValueError(f"Unsupported capture file version {version}")
+        offset = FILE_HEADER.size if offset is None else max(offset, FILE_HEADER.size)
+        end = len(mv)
+        while offset < end:
+            # A segment being written ends at an arbitrary byte (the writer flushes a buffer),
+            # so the record header, address or data may all be cut off: stop at the truncated tail
+            if offset + RECORD_HEADER.size > end:
+                break
+            length, ts_us, addr_len = RECORD_HEADER.unpack_from(mv, offset)
+            if offset + RECORD_HEADER.size + (addr_len + PORT.size if addr_len else 0) > end:
+                break
+            addr, offset = unpack_addr(mv, offset + RECORD_HEADER.size, addr_len)
+            if offset + length > end:
+                break
+            yield CaptureRecord(ts_us / 1e6 if ts_us else None, addr, mv[offset:offset + length])
+            offset += length
+    finally:
+        _close_mmap(mm, mv)
+
+
+def _ip_payload(frame, offset, ethertype, port):
+    """Return (src_addr, udp_payload_view) for a UDP datagram, or None for anything else."""
+    if ethertype == _ETH_IPV4:
+        ver_ihl = frame[offset]
+        if ver_ihl >> 4 != 4 or frame[offset + 9] != _IPPROTO_UDP:
+            return None
+        flags_frag, = _U16.unpack_from(frame, offset + 6)
+        if flags_frag & 0x3FFF:
+            return None  # fragments are not reassembled
+        src = socket.inet_ntop(socket.AF_INET, bytes(frame[offset + 12:offset + 16]))
+        udp = offset + (ver_ihl & 0x0F) * 4
+    elif ethertype == _ETH_IPV6:
+        if frame[offset + 6] != _IPPROTO_UDP:
+            return None  # extension headers are not followed
+        src = socket.inet_ntop(socket.AF_INET6, bytes(frame[offset + 8:offset + 24]))
+        udp = offset + 40
+    else:
+        return None
+    src_port, dst_port, udp_len = _UDP.unpack_from(frame, udp)
+    if port is not None and port != src_port and port != dst_port:
+        return None
+    end = min(udp + udp_len, len(frame))
+    return (src, src_port), frame[udp + 8:end]
+
+
+def _link_payload(frame, linktype, byteorder):
+    """Return (ethertype, offset of the IP header) for a captured frame."""
+    if linktype == LINKTYPE_ETHERNET:
+        ethertype, = _U16.unpack_from(frame, 12)
+        offset = 14
+        while ethertype in _ETH_VLAN:
+            ethertype, = _U16.unpack_from(frame, offset + 2)
+            offset += 4
+        return ethertype, offset
+    if linktype == LINKTYPE_LINUX_SLL:
+        return _U16.unpack_from(frame, 14)[0], 16
+    if linktype == LINKTYPE_LINUX_SLL2:
+        return _U16.unpack_from(frame, 0)[0], 20
+    if linktype == LINKTYPE_NULL:
+        family, = struct.unpack_from(byteorder + 'I', frame, 0)
+        return (_ETH_IPV4 if family == socket.AF_INET else _ETH_IPV6), 4
+    if linktype in (LINKTYPE_RAW, 12, 14):
+        return (_ETH_IPV4 if frame[0] >> 4 == 4 else _ETH_IPV6), 0
+    raise ValueError(f"Unsupported pcap link type {linktype}")
+
+
+def iter_pcap(path, port: int | None = None):
+    """
+    Yield CaptureRecord for every UDP payload in a classic pcap file.
+
+    Supports Ethernet (incl. VLAN tags), Linux cooked (SLL/SLL2), BSD loopback and raw IP
+    link types over IPv4/IPv6. ``port`` keeps only datagrams from or to that UDP port.
+    IP fragments and pcapng files are not supported.
+    """
+    mm = _open_mmap(path)
+    if mm is None:
+        return
+    mv = memoryview(mm)
+    try:
+        magic = bytes(mv[0:4])
+        if magic == _PCAPNG_MAGIC:
+            raise ValueError("pcapng files are not supported; convert with 'editcap -F pcap'")
+        if magic not in _PCAP_MAGIC:
+            raise ValueError(f"{path} is not a pcap file")
+        byteorder, ts_unit = _PCAP_MAGIC[magic]
+        global_header = struct.Struct(byteorder + '4xHHiIII')
+        record_header = struct.Struct(byteorder + 'IIII')
+        linktype = global_header.unpack_from(mv, 0)[5] & 0x0FFFFFFF
+        offset = global_header.size
+        end = len(mv)
+        while offset + record_header.size <= end:
+            ts_sec, ts_frac, incl_len, _ = record_header.unpack_from(mv, offset)
+            offset += record_header.size
+            if offset + incl_len > end:
+                break
+            frame = mv[offset:offset + incl_len]
+            offset += incl_len
+            try:
+                ethertype, ip_offset = _link_payload(frame, linktype, byteorder)
+                found = _ip_payload(frame, ip_offset, ethertype, port)
+            except (struct.error, IndexError):
+                continue  # snapped or truncated frame
+            if found is not None:
+                yield CaptureRecord(ts_sec + ts_frac * ts_unit, found[0], found[1])
+    finally:
+        _close_mmap(mm, mv)
+
+
+def iter_records(path, port: int | None = None):
+    """Yield CaptureRecord from a .cbpc capture or a pcap file, detected by its magic bytes."""
+    with open(path, 'rb') as f:
+        magic = f.read(4)
+    if magic == MAGIC:
+        return iter_capture(path)
+    return iter_pcap(path, port)
+
+
+def iter_packets(path, port: int | None = None, skip_malformed: bool = True):
+    """
+    Lazily yield (record, packet) pairs, decoding each datagram with decode_packet.
+    Malformed datagrams are skipped unless ``skip_malformed`` is False, in which case
+    the ValueError propagates.
+    """
+    for record in iter_records(path, port):
+        try:
+            packet = decode_packet(record.data)
+        except ValueError:
+            if skip_malformed:
+                continue
+            raise
+        yield record, packet
+
+
+__all__ = ['iter_capture', 'iter_pcap', 'iter_records', 'iter_packets']
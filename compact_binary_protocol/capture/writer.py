@@ -0,0 +1,172 @@
+"""
+Append-only, rotating writer for .cbpc capture segments (see capture.format).
+
+Records are appended through a large write buffer. A segment is closed and a new one started
+when it would exceed ``max_bytes`` or is older than ``max_age`` seconds. With ``index_interval``
+set, every Nth record and the first record of each IMEI in the segment get an entry in a
+sparse ``.idx`` file next to the segment, so replays can seek by time (seek_offset) or to a
+device's first record (seek_imei) instead of scanning the whole segment.
+"""
+import os
+import time
+import zlib
+
+from .format import (
+    MAGIC, FORMAT_VERSION, FILE_HEADER, INDEX_MAGIC, INDEX_ENTRY,
+    pack_record_header, imei_hash,
+)
+from ..encodings.bcd import IMEI_CACHE
+
+
+class CaptureWriter:
+    """
+    Write raw datagrams into rotating capture segments in ``directory``.
+
+    - prefix: segment file name prefix; files are named ``<prefix>-<UTC start>-<seq>.cbpc``.
+    - max_bytes / max_age: rotation thresholds (None disables either).
+    - buffer_size: bytes buffered in memory before they hit the file.
+    - index_interval: write an index entry every N records (1 = dense, None/0 = no index);
+      the first record of every IMEI in a segment is always indexed.
+
+    Usage:
+        with CaptureWriter('/var/lib/ingest/capture') as writer:
+            writer.write(data, addr)
+    """
+    def __init__(self, directory, prefix='capture', *, max_bytes=256 * 1024 * 1024, max_age=3600.0,
+                 buffer_size=1024 * 1024, index_interval=64):
+        self.directory = directory
+        self.prefix = prefix
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.buffer_size = buffer_size
+        self.index_interval = index_interval or 0
+        self.path = None
+        self.segments = []
+        self._file = None
+        self._index = None
+        self._size = 0
+        self._records = 0
+        self._imeis = set()  # IMEI hashes indexed in the current segment
+        self._opened_at = 0.0
+        self._seq = 0
+        os.makedirs(directory, exist_ok=True)
+
+    # ---- Segments ----
+    def _open_segment(self, now):
+        stamp = time.strftime('%Y%m%dT%H%M%S', time.gmtime(now))
+        while True:
+            self._seq += 1
+            path = os.path.join(self.directory, f"{self.prefix}-{stamp}-{self._seq:06d}.cbpc")
+            if not os.path.exists(path):
+                break
+        # 'xb' keeps segments append-only: an existing file is never truncated
+        self._file = open(path, 'xb', buffering=self.buffer_size)
+        self._file.write(FILE_HEADER.pack(MAGIC, FORMAT_VERSION))
+        if self.index_interval:
+            self._index = open(path + '.idx', 'xb', buffering=64 * 1024)
+            self._index.write(FILE_HEADER.pack(INDEX_MAGIC, FORMAT_VERSION))
+        self.path = path
+        self.segments.append(path)
+        self._size = FILE_HEADER.size
+        self._records = 0
+        self._imeis = set()
+        self._opened_at = now
+
+    def _close_segment(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if self._index is not None:
+            self._index.close()
+            self._index = None
+
+    def rotate(self):
+        """Close the current segment; the next write starts a new one."""
+        self._close_segment()
+
+    # ---- Writing ----
+    def write(self, data, addr=None, timestamp: float | None = None):
+        """Append one datagram received from ``addr`` at ``timestamp`` (default: now)."""
+        now = time.time() if timestamp is None else timestamp
+        ts_us = int(now * 1_000_000)
+        header = pack_record_header(len(data), ts_us, addr)
+        record_size = len(header) + len(data)
+        if self._file is not None and (
+            (self.max_bytes and self._size + record_size > self.max_bytes and self._records)
+            or (self.max_age and now - self._opened_at >= self.max_age)
+        ):
+            self._close_segment()
+        if self._file is None:
+            self._open_segment(now)
+        if self._index is not None:
+            h = imei_hash(data)
+            if self._records % self.index_interval == 0 or h not in self._imeis:
+                self._imeis.add(h)
+                self._index.write(INDEX_ENTRY.pack(ts_us, h, self._size))
+        self._file.write(header)
+        self._file.write(data)
+        self._size += record_size
+        self._records += 1
+
+    def flush(self):
+        if self._file is not None:
+            self._file.flush()
+        if self._index is not None:
+            self._index.flush()
+
+    def close(self):
+        self._close_segment()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def read_index(path):
+    """
+    Return the index entries of a segment as a list of (timestamp_us, imei_hash, offset).
+    ``path`` may be the segment or its .idx file.
+    """
+    if not path.endswith('.idx'):
+        path += '.idx'
+    with open(path, 'rb') as f:
+        data = f.read()
+    magic, version = FILE_HEADER.unpack_from(data, 0)
+    if magic != INDEX_MAGIC or version != FORMAT_VERSION:
+        raise ValueError(f"{path} is not a capture index")
+    usable = (len(data) - FILE_HEADER.size) // INDEX_ENTRY.size * INDEX_ENTRY.size
+    return list(INDEX_ENTRY.iter_unpack(memoryview(data)[FILE_HEADER.size:FILE_HEADER.size + usable]))
+
+
+def seek_offset(entries, timestamp: float) -> int:
+    """
+    Offset of the indexed record just before the first index entry later than ``timestamp``
+    (start of data if none). Entries are scanned in file order rather than bisected because
+    records written with an explicit ``timestamp`` need not be in time order; no indexed
+    record at or after ``timestamp`` is skipped either way.
+    """
+    ts_us = int(timestamp * 1_000_000)
+    offset = FILE_HEADER.size
+    for entry_ts, _, entry_offset in entries:
+        if entry_ts > ts_us:
+            break
+        offset = entry_offset
+    return offset
+
+
+def seek_imei(entries, imei) -> int | None:
+    """
+    Offset of the first record of device ``imei`` (str or packed-BCD bytes) in the segment,
+    or None if the device has no record in it. CRC-32 hashes can collide, so filter the
+    records read from this offset by IMEI.
+    """
+    h = zlib.crc32(IMEI_CACHE.encode(imei) if isinstance(imei, str) else imei)
+    for _, entry_hash, offset in entries:
+        if entry_hash == h:
+            return offset
+    return None
+
+
+__all__ = ['CaptureWriter', 'read_index', 'seek_offset', 'seek_imei']
@@ -0,0 +1,4 @@
+from .session import ClientPool, DeviceSession, TransactionAllocator, AckTimeout, ClientStats
+from .timer_wheel import TimerWheel
+
+__all__ = ['ClientPool', 'DeviceSession', 'TransactionAllocator', 'AckTimeout', 'ClientStats', 'TimerWheel']
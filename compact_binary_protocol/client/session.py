@@ -0,0 +1,277 @@
+"""
+Device-side client: many simulated devices sharing one UDP socket.
+
+ClientPool owns the socket, a TimerWheel for ack timeouts and the table of in-flight
+packets keyed by (packed-BCD IMEI, transaction ID), so Acks match however the IMEI was
+written (dashes, leading zeros). DeviceSession allocates 16-bit wrapping
+transaction IDs per device and sends packets whose futures resolve when the matching
+Ack arrives, in any order. Unacked packets are retransmitted with exponential backoff.
+A send whose (IMEI, transaction ID) is already in flight, e.g. a reply to a server command
+that reuses an ID the device allocated itself, is queued until the earlier one completes.
+"""
+import asyncio
+import logging
+from collections import deque
+
+from ..decoders import decode_packet, parse_header
+from ..encodings.bcd import IMEI_CACHE
+from ..packets import TelemetryPacket
+from .timer_wheel import TimerWheel
+
+logger = logging.getLogger(__name__)
+
+
+class AckTimeout(asyncio.TimeoutError):
+    """Raised when a packet is not acknowledged after all retries."""
+
+
+class TransactionAllocator:
+    """16-bit wrapping transaction counter that skips IDs still in flight."""
+    __slots__ = ('_next', '_in_use')
+
+    def __init__(self, start: int = 0):
+        self._next = start & 0xFFFF
+        self._in_use = set()
+
+    def allocate(self) -> int:
+        if len(self._in_use) >= 0x10000:
+            raise RuntimeError("All 65536 transaction IDs are in flight")
+        txn = self._next
+        while txn in self._in_use:
+            txn = (txn + 1) & 0xFFFF
+        self._next = (txn + 1) & 0xFFFF
+        self._in_use.add(txn)
+        return txn
+
+    def reserve(self, txn: int):
+        self._in_use.add(txn)
+
+    def release(self, txn: int):
+        self._in_use.discard(txn)
+
+
+class _InFlight:
+    __slots__ = ('session', 'data', 'future', 'attempt', 'handle')
+
+    def __init__(self, session, data, future):
+        self.session = session
+        self.data = data
+        self.future = future
+        self.attempt = 0
+        self.handle = None
+
+
+class ClientStats:
+    __slots__ = ('sent', 'retries', 'acked', 'timeouts', 'unmatched_acks', 'commands', 'malformed', 'queued')
+
+    def __init__(self):
+        for name in self.__slots__:
+            setattr(self, name, 0)
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class DeviceSession:
+    """One simulated device. Create through ClientPool.session(imei)."""
+    __slots__ = ('pool', 'imei', 'imei_bytes', 'txn')
+
+    def __init__(self, pool, imei: str, first_txn: int = 0):
+        self.pool = pool
+        self.imei = imei
+        self.imei_bytes = IMEI_CACHE.encode(imei)
+        self.txn = TransactionAllocator(first_txn)
+
+    def send(self, packet, transaction_id: int | None = None):
+        """
+        Send ``packet`` (its device_id must be this session's IMEI) and return a future
+        that resolves to the AckPacket, or fails with AckTimeout.
+        A new transaction ID is allocated unless ``transaction_id`` is given, which is
+        how replies to server commands reuse the request's ID. If that ID is still in flight
+        for this device, the packet is sent once the earlier one is acked or times out.
+        """
+        if transaction_id is None:
+            transaction_id = self.txn.allocate()
+        else:
+            self.txn.reserve(transaction_id)
+        packet.transaction_id = transaction_id
+        return self.pool._send(self, transaction_id, packet.to_bytes())
+
+    def send_telemetry(self, data, timestamp: int | None = None, transaction_id: int | None = None):
+        return self.send(TelemetryPacket(self.imei, timestamp, 0, 'T', data), transaction_id)
+
+
+class ClientPool:
+    """
+    Shared transport for many DeviceSessions.
+
+    - server: (host, port) of the UDP server.
+    - ack_timeout: seconds to wait for the first Ack (protocol default 30).
+    - retries: retransmissions after the first timeout; attempt n waits ack_timeout * backoff**n.
+    - tick / wheel_slots: TimerWheel resolution and size.
+    - on_command: optional ``async def on_command(session, packet)`` for server → device
+      commands (C, W, ...) addressed to a known session.
+
+    Usage:
+        async with ClientPool(('127.0.0.1', 10106)) as pool:
+            ack = await pool.session('358419511056392').send_telemetry([DataSteps(10)])
+    """
+    def __init__(self, server, *, ack_timeout: float = 30.0, retries: int = 0, backoff: float = 2.0,
+                 tick: float = 0.1, wheel_slots: int = 512, on_command=None):
+        self.server = server
+        self.ack_timeout = ack_timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.on_command = on_command
+        self.sessions = {}
+        self.stats = ClientStats()
+        self.transport = None
+        self._tick = tick
+        self._wheel_slots = wheel_slots
+        self._wheel = None
+        self._in_flight = {}
+        self._queued = {}  # key -> deque of (session, data, future) waiting for the key to free up
+        self._driver = None
+        self._loop = None
+
+    async def start(self):
+        self._loop = asyncio.get_running_loop()
+        self._wheel = TimerWheel(self._tick, self._wheel_slots, self._loop.time())
+        await self._loop.create_datagram_endpoint(lambda: _ClientProtocol(self), remote_addr=self.server)
+        self._driver = self._loop.create_task(self._drive_wheel())
+        return self
+
+    async def close(self):
+        if self._driver is not None:
+            self._driver.cancel()
+            await asyncio.gather(self._driver, return_exceptions=True)
+        if self.transport is not None:
+            self.transport.close()
+        for entry in self._in_flight.values():
+            if not entry.future.done():
+                entry.future.cancel()
+        self._in_flight.clear()
+        for queued in self._queued.values():
+            for _, _, future in queued:
+                future.cancel()
+        self._queued.clear()
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    def session(self, imei: str, first_txn: int = 0) -> DeviceSession:
+        """Session of device ``imei``; sessions are keyed by the packed-BCD IMEI."""
+        key = IMEI_CACHE.encode(imei)
+        s = self.sessions.get(key)
+        if s is None:
+            s = self.sessions[key] = DeviceSession(self, imei, first_txn)
+        return s
+
+    def in_flight(self) -> int:
+        return len(self._in_flight)
+
+    # ---- Send / retry ----
+    def _send(self, session, txn, data):
+        future = self._loop.create_future()
+        key = (session.imei_bytes, txn)
+        if key in self._in_flight:
+            self._queued.setdefault(key, deque()).append((session, data, future))
+            self.stats.queued += 1
+            return future
+        self._dispatch(key, session, data, future)
+        return future
+
+    def _dispatch(self, key, session, data, future):
+        entry = _InFlight(session, data, future)
+        self._in_flight[key] = entry
+        self.transport.sendto(data)
+        self.stats.sent += 1
+        entry.handle = self._wheel.schedule(self.ack_timeout, key, self._on_timeout)
+
+    def _on_timeout(self, key):
+        entry = self._in_flight.get(key)
+        if entry is None:
+            return
+        if entry.future.cancelled():
+            self._finish(key, entry)
+            return
+        if entry.attempt < self.retries:
+            entry.attempt += 1
+            self.transport.sendto(entry.data)
+            self.stats.retries += 1
+            entry.handle = self._wheel.schedule(self.ack_timeout * self.backoff ** entry.attempt, key, self._on_timeout)
+            return
+        self._finish(key, entry)
+        self.stats.timeouts += 1
+        entry.future.set_exception(AckTimeout(f"No Ack for transaction {key[1]} of {entry.session.imei}"))
+
+    def _finish(self, key, entry):
+        del self._in_flight[key]
+        queued = self._queued.get(key)
+        while queued:
+            session, data, future = queued.popleft()
+            if not future.cancelled():
+                # The transaction ID stays reserved for the queued packet
+                self._dispatch(key, session, data, future)
+                break
+        else:
+            entry.session.txn.release(key[1])
+        if queued is not None and not queued:
+            del self._queued[key]
+
+    async def _drive_wheel(self):
+        loop = self._loop
+        wheel = self._wheel
+        while True:
+            await asyncio.sleep(self._tick)
+            wheel.advance(loop.time())
+
+    # ---- Receive ----
+    def datagram_received(self, data):
+        try:
+            _, command, txn_id, imei_bytes, _, _ = parse_header(data)
+            if command == 'A\0':
+                key = (imei_bytes, txn_id)
+                entry = self._in_flight.get(key)
+                if entry is None:
+                    self.stats.unmatched_acks += 1
+                    return
+            packet = decode_packet(data)
+        except ValueError:
+            self.stats.malformed += 1
+            return
+        if command == 'A\0':
+            self._wheel.cancel(entry.handle, key)
+            self._finish(key, entry)
+            self.stats.acked += 1
+            if not entry.future.done():
+                entry.future.set_result(packet)
+            return
+        session = self.sessions.get(imei_bytes)
+        if session is None or self.on_command is None:
+            return
+        self.stats.commands += 1
+        self._loop.create_task(self._run_command(session, packet))
+
+    async def _run_command(self, session, packet):
+        try:
+            await self.on_command(session, packet)
+        except Exception:
+            logger.exception("Command handler failed for %s", session.imei)
+
+
+class _ClientProtocol(asyncio.DatagramProtocol):
+    def __init__(self, pool):
+        self.pool = pool
+
+    def connection_made(self, transport):
+        self.pool.transport = transport
+
+    def datagram_received(self, data, addr):
+        self.pool.datagram_received(data)
+
+    def error_received(self, exc):
+        logger.warning("UDP error: %s", exc)
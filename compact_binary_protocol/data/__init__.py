@@ -8,6 +8,7 @@ from .network_info import DataNetworkInfo
 from .customer_id import DataCustomerId
 from .device_status import DataDeviceStatus
 from .kv import DataKv
+from .raw import DataRaw
 
 __all__ = [
     'DataLocation',
@@ -20,4 +21,5 @@ __all__ = [
     'DataCustomerId',
     'DataDeviceStatus',
     'DataKv',
+    'DataRaw',
 ]
@@ -1,5 +1,7 @@
-import struct
 from .constants import TYPE_CUSTOMER_ID
+from ..encodings.codec import ITEM_HEADER, VarItemStructs
+
+_ITEMS = VarItemStructs()
 
 class DataCustomerId:
     """
@@ -11,9 +13,11 @@ class DataCustomerId:
 
     Accepts a hex string (even-length, optional 0x prefix) or bytes/bytearray.
     """
+    __slots__ = ('_raw',)
+    sensor_type = TYPE_CUSTOMER_ID
+    sensor_version = 1
+
     def __init__(self, customer_id):
-        self.sensor_type = TYPE_CUSTOMER_ID
-        self.sensor_version = 1
         self._raw = b""
         # Normalize to raw bytes similar to previous PowerOnPacket handling
         try:
@@ -24,7 +28,7 @@ class DataCustomerId:
                 if len(hex_str) % 2 != 0:
                     raise ValueError("customer_id hex must have even length")
                 self._raw = bytes.fromhex(hex_str) if hex_str else b""
-            elif isinstance(customer_id, (bytes, bytearray)):
+            elif isinstance(customer_id, (bytes, bytearray, memoryview)):
                 self._raw = bytes(customer_id)
             elif customer_id is None:
                 self._raw = b""
@@ -37,9 +41,25 @@ class DataCustomerId:
             self._raw = self._raw[:255]
 
     def to_bytes(self):
-        payload = struct.pack('>B', len(self._raw)) + self._raw
-        header = struct.pack('>BBH', self.sensor_type, self.sensor_version, len(payload))
-        return header + payload
+        n = len(self._raw)
+        return _ITEMS[n,].pack(self.sensor_type, self.sensor_version, 1 + n, n, self._raw)
+
+    def size_hint(self):
+        return ITEM_HEADER.size + 1 + len(self._raw)
+
+    def write_into(self, buf, offset=0):
+        n = len(self._raw)
+        s = _ITEMS[n,]
+        s.pack_into(buf, offset, self.sensor_type, self.sensor_version, 1 + n, n, self._raw)
+        return offset + s.size
+
+    @classmethod
+    def from_payload(cls, payload):
+        """Decode a CustomerId payload (VarBytes) from a bytes-like object."""
+        length = payload[0]
+        if 1 + length > len(payload):
+            raise ValueError(f"Not enough data to read customer id of length {length}")
+        return cls(bytes(payload[1:1 + length]))
 
     def describe(self):
         return (
@@ -1,17 +1,31 @@
-import struct
 from .constants import TYPE_DEVICE_STATUS
+from ..encodings.codec import DEVICE_STATUS, DEVICE_STATUS_ITEM
 
 class DataDeviceStatus:
+    __slots__ = ('battery', 'rssi')
+    sensor_type = TYPE_DEVICE_STATUS
+    sensor_version = 1
+
     def __init__(self, battery: int, rssi: int):
-        self.sensor_type = TYPE_DEVICE_STATUS
-        self.sensor_version = 1
         self.battery = int(battery)
         self.rssi = int(rssi)
 
     def to_bytes(self):
-        payload = struct.pack('>BB', self.battery, self.rssi)
-        header = struct.pack('>BBH', self.sensor_type, self.sensor_version, len(payload))
-        return header + payload
+        return DEVICE_STATUS_ITEM.pack(self.sensor_type, self.sensor_version, DEVICE_STATUS.size,
+                                       self.battery, self.rssi)
+
+    def size_hint(self):
+        return DEVICE_STATUS_ITEM.size
+
+    def write_into(self, buf, offset=0):
+        DEVICE_STATUS_ITEM.pack_into(buf, offset, self.sensor_type, self.sensor_version, DEVICE_STATUS.size,
+                                     self.battery, self.rssi)
+        return offset + DEVICE_STATUS_ITEM.size
+
+    @classmethod
+    def from_payload(cls, payload):
+        battery, rssi = DEVICE_STATUS.unpack_from(payload)
+        return cls(battery, rssi)
 
     def describe(self):
         return (
@@ -1,20 +1,36 @@
-import struct
 from .constants import TYPE_ENVIRONMENT
+from ..encodings.codec import ENVIRONMENT, ENVIRONMENT_ITEM
 
 
 class DataEnvironment:
+    __slots__ = ('temperature', 'humidity', 'illumination', 'motion')
+    sensor_type = TYPE_ENVIRONMENT
+    sensor_version = 1
+
     def __init__(self, temperature, humidity, illumination, motion):
-        self.sensor_type = int(TYPE_ENVIRONMENT)
-        self.sensor_version = 1
         self.temperature = float(temperature)
         self.humidity = float(humidity)
         self.illumination = float(illumination)
         self.motion = bool(motion)
 
     def to_bytes(self):
-        payload = struct.pack('>HHHB', int(self.temperature * 10), int(self.humidity*10), int(self.illumination), self.motion)
-        header = struct.pack('>BBH', self.sensor_type, self.sensor_version, len(payload))
-        return header + payload
+        return ENVIRONMENT_ITEM.pack(self.sensor_type, self.sensor_version, ENVIRONMENT.size,
+                                     int(self.temperature * 10), int(self.humidity * 10), int(self.illumination),
+                                     self.motion)
+
+    def size_hint(self):
+        return ENVIRONMENT_ITEM.size
+
+    def write_into(self, buf, offset=0):
+        ENVIRONMENT_ITEM.pack_into(buf, offset, self.sensor_type, self.sensor_version, ENVIRONMENT.size,
+                                   int(self.temperature * 10), int(self.humidity * 10), int(self.illumination),
+                                   self.motion)
+        return offset + ENVIRONMENT_ITEM.size
+
+    @classmethod
+    def from_payload(cls, payload):
+        temperature, humidity, illumination, motion = ENVIRONMENT.unpack_from(payload)
+        return cls(temperature / 10, humidity / 10, illumination, motion)
 
     def describe(self):
         return f"Environment(type={self.sensor_type}, ver={self.sensor_version}, temp={self.temperature}°C, hum={self.humidity}%, illum={self.illumination}lx, motion={self.motion})"
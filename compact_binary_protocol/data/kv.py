@@ -1,5 +1,5 @@
-import struct
-from ..encodings import encode_var_string
+from ..encodings.codec import ITEM_HEADER
+from ..encodings.kv import KV_CACHE, encode_kv_pairs, kv_payload_size, normalize_kv_pairs
 from .constants import TYPE_KV
 
 class DataKv:
@@ -13,35 +13,37 @@ class DataKv:
         - repeat count times: key VarString, value VarString (ASCII)
     All keys and values are encoded as strings.
     """
+    __slots__ = ('pairs',)
+    sensor_type = TYPE_KV
+    sensor_version = 1
+
     def __init__(self, kv_pairs=None):
-        self.sensor_type = TYPE_KV
-        self.sensor_version = 1
-        # Normalize input to list[tuple[str,str]]
-        pairs_list = []
-        if kv_pairs is None:
-            items = []
-        elif isinstance(kv_pairs, dict):
-            items = list(kv_pairs.items())
-        else:
-            items = list(kv_pairs)
-        for k, v in items:
-            if k is None:
-                continue
-            ks = str(k)
-            vs = '' if v is None else str(v)
-            pairs_list.append((ks, vs))
-        self.pairs = pairs_list
+        self.pairs = normalize_kv_pairs(kv_pairs)
 
     def to_bytes(self) -> bytes:
-        # Build payload: count + VarString pairs
-        count = len(self.pairs)
-        payload = struct.pack('>B', count)
-        for k, v in self.pairs:
-            payload += encode_var_string(k)
-            payload += encode_var_string(v)
-        # Prepend SensorData header (type, version, length)
-        header = struct.pack('>BBH', self.sensor_type, self.sensor_version, len(payload))
-        return header + payload
+        payload = encode_kv_pairs(self.pairs)
+        return ITEM_HEADER.pack(self.sensor_type, self.sensor_version, len(payload)) + payload
+
+    def size_hint(self):
+        return ITEM_HEADER.size + kv_payload_size(self.pairs)
+
+    def write_into(self, buf, offset=0):
+        payload = encode_kv_pairs(self.pairs)
+        start = offset + ITEM_HEADER.size
+        end = start + len(payload)
+        if end > len(buf):
+            raise ValueError(f"Buffer too small to write {end - offset} bytes at offset {offset}")
+        ITEM_HEADER.pack_into(buf, offset, self.sensor_type, self.sensor_version, len(payload))
+        buf[start:end] = payload
+        return end
+
+    @classmethod
+    def from_payload(cls, payload):
+        """Decode a DataKv payload (count + key/value VarStrings) from a bytes-like object.
+        Repeated payloads are served from KV_CACHE; keys are interned."""
+        item = cls.__new__(cls)
+        item.pairs = list(KV_CACHE.decode_pairs(payload))
+        return item
 
     def describe(self) -> str:
         items = ', '.join(f"{k}={v}" for k, v in self.pairs)
@@ -1,7 +1,10 @@
-import struct
-from ..encodings import encode_var_string
+from ..encodings import decode_var_string
+from ..encodings.codec import ITEM_HEADER, GNSS, GNSS_ITEM, U8, I8, VarItemStructs, var_string_size
 from .constants import TYPE_LOCATION
 
+# Cell payload: [subtype u8][mcc][mnc][lac][cell_id VarStrings][rssi i8]
+_CELL_ITEMS = VarItemStructs('B', 'b')
+
 class DataLocation:
     """
     LocationData encoded as a SensorData item with [type, version, length] header.
@@ -11,9 +14,11 @@ class DataLocation:
     TYPE_GNSS = 1
     TYPE_CELL = 2
 
+    __slots__ = ('loc_type', 'latitude', 'longitude', 'mcc', 'mnc', 'lac', 'cell_id', 'rssi')
+    sensor_type = TYPE_LOCATION
+    sensor_version = 1
+
     def __init__(self, loc_type, *, latitude=None, longitude=None, mcc=None, mnc=None, lac=None, cell_id=None, rssi=None):
-        self.sensor_type = TYPE_LOCATION
-        self.sensor_version = 1
         self.loc_type = int(loc_type)
         self.latitude = latitude
         self.longitude = longitude
@@ -31,31 +36,68 @@ class DataLocation:
     def cell(mcc, mnc, lac, cell_id, rssi):
         return DataLocation(DataLocation.TYPE_CELL, mcc=str(mcc), mnc=str(mnc), lac=str(lac), cell_id=str(cell_id), rssi=int(rssi))
 
-    def _payload_bytes(self):
+    def _check(self):
         if self.loc_type == DataLocation.TYPE_GNSS:
             if self.latitude is None or self.longitude is None:
                 raise ValueError("GNSS LocationData requires latitude and longitude")
-            # Subtype + two floats (lat, lon)
-            return struct.pack('>Bff', self.loc_type, float(self.latitude), float(self.longitude))
         elif self.loc_type == DataLocation.TYPE_CELL:
             if None in (self.mcc, self.mnc, self.lac, self.cell_id) or self.rssi is None:
                 raise ValueError("CELL LocationData requires mcc, mnc, lac, cell_id, and rssi")
-            from_bytes = struct.pack('>B', self.loc_type)
-            return (
-                from_bytes
-                + encode_var_string(self.mcc)
-                + encode_var_string(self.mnc)
-                + encode_var_string(self.lac)
-                + encode_var_string(self.cell_id)
-                + struct.pack('>b', int(self.rssi))
-            )
         else:
             raise ValueError(f"Unknown DataLocation type: {self.loc_type}")
 
+    def _cell_strings(self):
+        return (self.mcc.encode('ascii')[:255], self.mnc.encode('ascii')[:255],
+                self.lac.encode('ascii')[:255], self.cell_id.encode('ascii')[:255])
+
     def to_bytes(self):
-        payload = self._payload_bytes()
-        header = struct.pack('>BBH', self.sensor_type, self.sensor_version, len(payload))
-        return header + payload
+        self._check()
+        if self.loc_type == DataLocation.TYPE_GNSS:
+            # Subtype + two floats (lat, lon)
+            return GNSS_ITEM.pack(self.sensor_type, self.sensor_version, GNSS.size,
+                                  self.loc_type, float(self.latitude), float(self.longitude))
+        mcc, mnc, lac, cell_id = self._cell_strings()
+        n1, n2, n3, n4 = len(mcc), len(mnc), len(lac), len(cell_id)
+        return _CELL_ITEMS[n1, n2, n3, n4].pack(self.sensor_type, self.sensor_version, 6 + n1 + n2 + n3 + n4,
+                                                self.loc_type, n1, mcc, n2, mnc, n3, lac, n4, cell_id, int(self.rssi))
+
+    def size_hint(self):
+        self._check()
+        if self.loc_type == DataLocation.TYPE_GNSS:
+            return GNSS_ITEM.size
+        return (ITEM_HEADER.size + U8.size
+                + var_string_size(self.mcc) + var_string_size(self.mnc)
+                + var_string_size(self.lac) + var_string_size(self.cell_id)
+                + I8.size)
+
+    def write_into(self, buf, offset=0):
+        self._check()
+        if self.loc_type == DataLocation.TYPE_GNSS:
+            GNSS_ITEM.pack_into(buf, offset, self.sensor_type, self.sensor_version, GNSS.size,
+                                self.loc_type, float(self.latitude), float(self.longitude))
+            return offset + GNSS_ITEM.size
+        # Header, subtype, the four VarStrings and rssi in one pack_into
+        mcc, mnc, lac, cell_id = self._cell_strings()
+        n1, n2, n3, n4 = len(mcc), len(mnc), len(lac), len(cell_id)
+        s = _CELL_ITEMS[n1, n2, n3, n4]
+        s.pack_into(buf, offset, self.sensor_type, self.sensor_version, 6 + n1 + n2 + n3 + n4,
+                    self.loc_type, n1, mcc, n2, mnc, n3, lac, n4, cell_id, int(self.rssi))
+        return offset + s.size
+
+    @classmethod
+    def from_payload(cls, payload):
+        loc_type = payload[0]
+        if loc_type == DataLocation.TYPE_GNSS:
+            _, latitude, longitude = GNSS.unpack_from(payload)
+            return cls(loc_type, latitude=latitude, longitude=longitude)
+        elif loc_type == DataLocation.TYPE_CELL:
+            mcc, offset = decode_var_string(payload, 1)
+            mnc, offset = decode_var_string(payload, offset)
+            lac, offset = decode_var_string(payload, offset)
+            cell_id, offset = decode_var_string(payload, offset)
+            rssi, = I8.unpack_from(payload, offset)
+            return cls(loc_type, mcc=mcc, mnc=mnc, lac=lac, cell_id=cell_id, rssi=rssi)
+        raise ValueError(f"Unknown DataLocation type: {loc_type}")
 
     def describe(self):
         if self.loc_type == DataLocation.TYPE_GNSS:
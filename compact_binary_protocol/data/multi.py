@@ -1,37 +1,193 @@
-import struct
+import sys
+from array import array
+from types import MappingProxyType
+
 from .constants import TYPE_MULTI
+from .._numpy import require_numpy
+from ..encodings.codec import MULTI_HEAD, MULTI_ITEM_HEAD, MULTI_RECORD
+
+# array('h') holds host-order int16; the wire is big-endian
+_SWAP = sys.byteorder == 'little'
+
 
 class DataMulti:
+    """
+    Series of temperature/humidity records sampled every ``interval`` seconds from ``first_timestamp``.
+
+    Records are stored without per-record objects: as an array('h') of interleaved
+    [temp0, hum0, temp1, hum1, ...] in tenths (see record_values()) or, when built with
+    from_arrays()/from_payload_arrays(), as a NumPy structured array whose layout is exactly
+    the wire format (big-endian int16 tenths). ``records`` builds a read-only tuple of
+    read-only mappings ({'temperature': C, 'humidity': %}) on each access, so in-place edits
+    fail loudly; assign a new sequence to it to replace the records.
+    """
+    __slots__ = ('first_timestamp', 'interval', '_values', '_array')
+    sensor_type = TYPE_MULTI
+    sensor_version = 1
+
+    # Wire layout of one record, used by the NumPy path (created lazily, numpy is optional)
+    _record_dtype = None
+
     def __init__(self, first_timestamp, interval, records):
-        self.sensor_type = int(TYPE_MULTI)
-        self.sensor_version = int(1)
         self.first_timestamp = first_timestamp
         self.interval = interval
         self.records = records
 
-        if len(self.records) > 255:
-            self.records = self.records[:255]
+    # ---- Record storage ----
+    @property
+    def records(self):
+        if self._array is not None:
+            arr = self._array
+            pairs = zip(arr['temperature'].tolist(), arr['humidity'].tolist())
+        else:
+            values = self._values
+            pairs = zip(values[0::2], values[1::2])
+        return tuple(
+            MappingProxyType({'temperature': temp / 10, 'humidity': hum / 10})
+            for temp, hum in pairs
+        )
+
+    @records.setter
+    def records(self, records):
+        values = array('h')
+        append = values.append
+        try:
+            for rec in records[:255]:
+                append(round(float(rec['temperature']) * 10))
+                append(round(float(rec['humidity']) * 10))
+        except OverflowError as e:
+            raise ValueError(f"Multi record out of range for int16 tenths: {e}") from e
+        self._values = values
+        self._array = None
+
+    def record_values(self) -> array:
+        """Records as array('h') of interleaved [temp0, hum0, temp1, hum1, ...] in tenths."""
+        if self._array is not None:
+            return array('h', self._array.view('>i2').tolist())
+        return self._values
+
+    def record_count(self) -> int:
+        return len(self._values) // 2 if self._array is None else len(self._array)
+
+    # ---- NumPy path ----
+    @classmethod
+    def record_dtype(cls):
+        """NumPy structured dtype of one wire record: temperature/humidity as big-endian int16 tenths."""
+        if cls._record_dtype is None:
+            np = require_numpy()
+            DataMulti._record_dtype = np.dtype([('temperature', '>i2'), ('humidity', '>i2')])
+        return cls._record_dtype
+
+    @classmethod
+    def from_arrays(cls, first_timestamp, interval, temperature, humidity):
+        """
+        Build a DataMulti from array-likes of temperature (°C) and humidity (%RH).
+        Values are scaled to tenths and rounded half-to-even like the list path.
+        """
+        np = require_numpy()
+        temperature = np.asarray(temperature, dtype=np.float64)[:255]
+        humidity = np.asarray(humidity, dtype=np.float64)[:255]
+        if temperature.shape != humidity.shape:
+            raise ValueError("temperature and humidity must have the same length")
+        arr = np.empty(len(temperature), dtype=cls.record_dtype())
+        for name, values in (('temperature', temperature), ('humidity', humidity)):
+            tenths = np.rint(values * 10)
+            if len(tenths) and (tenths.min() < -32768 or tenths.max() > 32767):
+                raise ValueError(f"{name} out of range for int16 tenths")
+            arr[name] = tenths
+        return cls._from_record_array(first_timestamp, interval, arr)
+
+    @classmethod
+    def _from_record_array(cls, first_timestamp, interval, arr):
+        item = cls.__new__(cls)
+        item.first_timestamp = first_timestamp
+        item.interval = interval
+        item._values = None
+        item._array = arr
+        return item
+
+    @classmethod
+    def _from_values(cls, first_timestamp, interval, values):
+        item = cls.__new__(cls)
+        item.first_timestamp = first_timestamp
+        item.interval = interval
+        item._values = values
+        item._array = None
+        return item
+
+    def record_array(self):
+        """Records as a structured array in wire layout (temperature/humidity int16 tenths)."""
+        if self._array is not None:
+            return self._array
+        np = require_numpy()
+        return np.array(self._values, dtype='>i2').view(self.record_dtype())
+
+    def arrays(self):
+        """Return (temperature, humidity) as float64 arrays in °C and %RH."""
+        arr = self.record_array()
+        return arr['temperature'] / 10, arr['humidity'] / 10
+
+    def timestamps(self):
+        """Per-sample Unix timestamps: first_timestamp + interval * i, as an int64 array."""
+        np = require_numpy()
+        return int(self.first_timestamp) + int(self.interval) * np.arange(self.record_count(), dtype=np.int64)
+
+    @classmethod
+    def from_payload_arrays(cls, payload):
+        """Decode a Multi payload into an array-backed DataMulti using np.frombuffer (no per-record objects)."""
+        np = require_numpy()
+        first_timestamp, interval, count = MULTI_HEAD.unpack_from(payload)
+        if MULTI_HEAD.size + MULTI_RECORD.size * count > len(payload):
+            raise ValueError(f"Not enough data to read {count} Multi records")
+        arr = np.frombuffer(payload, dtype=cls.record_dtype(), count=count, offset=MULTI_HEAD.size)
+        return cls._from_record_array(first_timestamp, interval, arr)
+
+    # ---- Encoding ----
+    def _wire_records(self):
+        # Record bytes exactly as on the wire (big-endian int16 tenths)
+        if self._array is not None:
+            return self._array.tobytes()
+        if not _SWAP:
+            return self._values.tobytes()
+        values = array('h', self._values)
+        values.byteswap()
+        return values.tobytes()
+
+    def _head(self, count):
+        return (self.sensor_type, self.sensor_version, MULTI_HEAD.size + MULTI_RECORD.size * count,
+                int(self.first_timestamp), int(self.interval), count)
+
+    def size_hint(self):
+        return MULTI_ITEM_HEAD.size + MULTI_RECORD.size * self.record_count()
 
     def to_bytes(self):
-        payload_header = struct.pack(
-            '>IHB',
-            int(self.first_timestamp),
-            int(self.interval),
-            len(self.records)
-        )
-        records_bytes = bytearray()
-        for rec in self.records:
-            temp = int(round(float(rec['temperature']) * 10))
-            hum = int(round(float(rec['humidity']) * 10))
-            records_bytes += struct.pack('>hh', temp, hum)
-        payload = payload_header + bytes(records_bytes)
-        header = struct.pack('>BBH', self.sensor_type, self.sensor_version, len(payload))
-        return header + payload
+        return MULTI_ITEM_HEAD.pack(*self._head(self.record_count())) + self._wire_records()
+
+    def write_into(self, buf, offset=0):
+        count = self.record_count()
+        MULTI_ITEM_HEAD.pack_into(buf, offset, *self._head(count))
+        offset += MULTI_ITEM_HEAD.size
+        end = offset + MULTI_RECORD.size * count
+        if end > len(buf):
+            raise ValueError(f"Buffer too small to write {count} Multi records at offset {offset}")
+        buf[offset:end] = self._wire_records()
+        return end
+
+    @classmethod
+    def from_payload(cls, payload):
+        first_timestamp, interval, count = MULTI_HEAD.unpack_from(payload)
+        end = MULTI_HEAD.size + MULTI_RECORD.size * count
+        if end > len(payload):
+            raise ValueError(f"Not enough data to read {count} Multi records")
+        values = array('h')
+        values.frombytes(payload[MULTI_HEAD.size:end])
+        if _SWAP:
+            values.byteswap()
+        return cls._from_values(first_timestamp, interval, values)
 
     def describe(self):
-        rec_cnt = len(self.records) if self.records is not None else 0
         return (
             f"Multi(type={self.sensor_type}, ver={self.sensor_version}, "
             f"first_ts={self.first_timestamp}, "
-            f"interval={self.interval}s, records={rec_cnt})"
+            f"interval={self.interval}s, records={self.record_count()})"
         )
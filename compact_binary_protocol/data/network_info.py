@@ -1,20 +1,51 @@
-import struct
-from ..encodings import encode_var_string
+from ..encodings import decode_var_string
+from ..encodings.codec import ITEM_HEADER, VarItemStructs, var_string_size
 from .constants import TYPE_NETWORK_INFO
 
+_ITEMS = VarItemStructs()
+
 class DataNetworkInfo:
+    __slots__ = ('mcc', 'mnc', 'rat')
+    sensor_type = TYPE_NETWORK_INFO
+    sensor_version = 1
+
     def __init__(self, mcc: str, mnc: str, rat: str):
         # Assign a distinct sensor type id
-        self.sensor_type = TYPE_NETWORK_INFO
-        self.sensor_version = 1
         self.mcc = '' if mcc is None else str(mcc)
         self.mnc = '' if mnc is None else str(mnc)
         self.rat = '' if rat is None else str(rat)
 
     def to_bytes(self):
-        payload = encode_var_string(self.mcc) + encode_var_string(self.mnc) + encode_var_string(self.rat)
-        header = struct.pack('>BBH', self.sensor_type, self.sensor_version, len(payload))
-        return header + payload
+        mcc = self.mcc.encode('ascii')[:255]
+        mnc = self.mnc.encode('ascii')[:255]
+        rat = self.rat.encode('ascii')[:255]
+        n1 = len(mcc)
+        n2 = len(mnc)
+        n3 = len(rat)
+        return _ITEMS[n1, n2, n3].pack(self.sensor_type, self.sensor_version, 3 + n1 + n2 + n3,
+                                        n1, mcc, n2, mnc, n3, rat)
+
+    def size_hint(self):
+        return ITEM_HEADER.size + var_string_size(self.mcc) + var_string_size(self.mnc) + var_string_size(self.rat)
+
+    def write_into(self, buf, offset=0):
+        # Header and the three VarStrings in one pack_into
+        mcc = self.mcc.encode('ascii')[:255]
+        mnc = self.mnc.encode('ascii')[:255]
+        rat = self.rat.encode('ascii')[:255]
+        n1 = len(mcc)
+        n2 = len(mnc)
+        n3 = len(rat)
+        s = _ITEMS[n1, n2, n3]
+        s.pack_into(buf, offset, self.sensor_type, self.sensor_version, 3 + n1 + n2 + n3, n1, mcc, n2, mnc, n3, rat)
+        return offset + s.size
+
+    @classmethod
+    def from_payload(cls, payload):
+        mcc, offset = decode_var_string(payload, 0)
+        mnc, offset = decode_var_string(payload, offset)
+        rat, offset = decode_var_string(payload, offset)
+        return cls(mcc, mnc, rat)
 
     def describe(self):
         return (
@@ -1,16 +1,25 @@
-import struct
 from .constants import TYPE_NULL
+from ..encodings.codec import ITEM_HEADER
 
 class DataNull:
-    def __init__(self):
-        self.sensor_type = TYPE_NULL
-        self.sensor_version = 0
+    __slots__ = ()
+    sensor_type = TYPE_NULL
+    sensor_version = 0
 
     def to_bytes(self):
         # Empty payload
-        payload = b''
-        header = struct.pack('>BBH', self.sensor_type, self.sensor_version, len(payload))
-        return header + payload
+        return ITEM_HEADER.pack(self.sensor_type, self.sensor_version, 0)
+
+    def size_hint(self):
+        return ITEM_HEADER.size
+
+    def write_into(self, buf, offset=0):
+        ITEM_HEADER.pack_into(buf, offset, self.sensor_type, self.sensor_version, 0)
+        return offset + ITEM_HEADER.size
+
+    @classmethod
+    def from_payload(cls, payload):
+        return cls()
 
     def describe(self):
         return f"Null(type={self.sensor_type}, ver={self.sensor_version})"
@@ -0,0 +1,32 @@
+from ..encodings.codec import ITEM_HEADER
+
+class DataRaw:
+    """
+    Data item of a type/version this library does not decode.
+
+    The payload is kept verbatim so the item can be inspected or re-encoded unchanged.
+    """
+    __slots__ = ('sensor_type', 'sensor_version', 'payload')
+
+    def __init__(self, sensor_type: int, sensor_version: int, payload=b''):
+        self.sensor_type = int(sensor_type)
+        self.sensor_version = int(sensor_version)
+        self.payload = bytes(payload)
+
+    def to_bytes(self):
+        return ITEM_HEADER.pack(self.sensor_type, self.sensor_version, len(self.payload)) + self.payload
+
+    def size_hint(self):
+        return ITEM_HEADER.size + len(self.payload)
+
+    def write_into(self, buf, offset=0):
+        start = offset + ITEM_HEADER.size
+        end = start + len(self.payload)
+        if end > len(buf):
+            raise ValueError(f"Buffer too small to write {len(self.payload)} bytes at offset {start}")
+        ITEM_HEADER.pack_into(buf, offset, self.sensor_type, self.sensor_version, len(self.payload))
+        buf[start:end] = self.payload
+        return end
+
+    def describe(self):
+        return f"Raw(type={self.sensor_type}, ver={self.sensor_version}, len={len(self.payload)} bytes)"
@@ -1,16 +1,28 @@
-import struct
 from .constants import TYPE_STEPS
+from ..encodings.codec import STEPS, STEPS_ITEM
 
 class DataSteps:
+    __slots__ = ('steps',)
+    sensor_type = TYPE_STEPS
+    sensor_version = 1
+
     def __init__(self, steps: int):
-        self.sensor_type = TYPE_STEPS
-        self.sensor_version = 1
         self.steps = int(steps)
 
     def to_bytes(self):
-        payload = struct.pack('>i', self.steps)
-        header = struct.pack('>BBH', self.sensor_type, self.sensor_version, len(payload))
-        return header + payload
+        return STEPS_ITEM.pack(self.sensor_type, self.sensor_version, STEPS.size, self.steps)
+
+    def size_hint(self):
+        return STEPS_ITEM.size
+
+    def write_into(self, buf, offset=0):
+        STEPS_ITEM.pack_into(buf, offset, self.sensor_type, self.sensor_version, STEPS.size, self.steps)
+        return offset + STEPS_ITEM.size
+
+    @classmethod
+    def from_payload(cls, payload):
+        steps, = STEPS.unpack_from(payload)
+        return cls(steps)
 
     def describe(self):
         return (
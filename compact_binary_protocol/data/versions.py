@@ -1,21 +1,46 @@
-import struct
-from ..encodings import encode_var_string
+from ..encodings import decode_var_string
+from ..encodings.codec import ITEM_HEADER, VarItemStructs, var_string_size
 from .constants import TYPE_VERSIONS
 
+_ITEMS = VarItemStructs()
+
 class DataVersions:
+    __slots__ = ('software_version', 'modem_version')
+    sensor_type = TYPE_VERSIONS
+    sensor_version = 1
+
     def __init__(self, software_version: str, modem_version: str):
-        self.sensor_type = TYPE_VERSIONS
-        self.sensor_version = 1
         self.software_version = str(software_version) if software_version is not None else ''
         self.modem_version = str(modem_version) if modem_version is not None else ''
 
     def to_bytes(self):
-        payload = encode_var_string(self.software_version) + encode_var_string(self.modem_version)
-        header = struct.pack('>BBH', self.sensor_type, self.sensor_version, len(payload))
-        return header + payload
+        software = self.software_version.encode('ascii')[:255]
+        modem = self.modem_version.encode('ascii')[:255]
+        n1 = len(software)
+        n2 = len(modem)
+        return _ITEMS[n1, n2].pack(self.sensor_type, self.sensor_version, 2 + n1 + n2, n1, software, n2, modem)
+
+    def size_hint(self):
+        return ITEM_HEADER.size + var_string_size(self.software_version) + var_string_size(self.modem_version)
+
+    def write_into(self, buf, offset=0):
+        # Header and both VarStrings in one pack_into
+        software = self.software_version.encode('ascii')[:255]
+        modem = self.modem_version.encode('ascii')[:255]
+        n1 = len(software)
+        n2 = len(modem)
+        s = _ITEMS[n1, n2]
+        s.pack_into(buf, offset, self.sensor_type, self.sensor_version, 2 + n1 + n2, n1, software, n2, modem)
+        return offset + s.size
+
+    @classmethod
+    def from_payload(cls, payload):
+        software_version, offset = decode_var_string(payload, 0)
+        modem_version, offset = decode_var_string(payload, offset)
+        return cls(software_version, modem_version)
 
     def describe(self):
         return (
             f"Versions(type={self.sensor_type}, ver={self.sensor_version}, "
             f"software='{self.software_version}', modem='{self.modem_version}')"
-        )
\ No newline at end of file
+        )
@@ -1,4 +1,12 @@
-from .packet_decoder import PacketDecoder
+from .header import parse_header, build_ack, ack_for
+from .registry import DataRegistry, DATA_REGISTRY, register_data_type
+from .packet_decoder import PacketDecoder, decode_packet
 from .data_reader import DataReader
+from .batch import decode_batch
+from .view import PacketView, ItemView
+from .identity import IdentityCache, IDENTITY_TYPES, UNCHANGED
+from .validate import ValidatingDecoder, InvalidPacket, ERROR_NAMES
 
-__all__ = ['PacketDecoder', 'DataReader']
+__all__ = ['PacketDecoder', 'DataReader', 'decode_packet', 'parse_header', 'build_ack', 'ack_for', 'decode_batch', 'PacketView', 'ItemView',
+           'DataRegistry', 'DATA_REGISTRY', 'register_data_type', 'IdentityCache', 'IDENTITY_TYPES', 'UNCHANGED',
+           'ValidatingDecoder', 'InvalidPacket', 'ERROR_NAMES']
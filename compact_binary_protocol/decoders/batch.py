@@ -0,0 +1,205 @@
+"""
+Columnar batch decoding of many datagrams.
+
+decode_batch() walks each datagram once and appends decoded fields straight into
+per-table column lists, without creating Packet or Data* objects. The result can be
+loaded directly into a dataframe, e.g. ``pandas.DataFrame(result['multi'])``.
+"""
+import struct
+
+from .._numpy import require_numpy
+from ..data.constants import TYPE_MULTI, TYPE_ENVIRONMENT, TYPE_LOCATION, TYPE_DEVICE_STATUS, TYPE_STEPS
+from ..data.location import DataLocation
+from ..encodings.codec import (
+    ITEM_HEADER,
+    MULTI_HEAD, MULTI_RECORD, ENVIRONMENT, GNSS, DEVICE_STATUS, STEPS,
+    multi_records_struct,
+)
+from ..packets import Packet
+from .header import parse_header
+from .registry import DataRegistry
+
+# Output tables: name -> ((column, numpy dtype), ...). Every per-type table carries a
+# 'packet' column holding the row index of the source packet in the 'packets' table.
+# Commands are reported without the NUL padding byte ('T', 'C', 'P+').
+TABLES = {
+    'packets': (('imei', 'U'), ('command', 'U2'), ('txn_id', 'u2'), ('timestamp', 'i8')),
+    'multi': (('packet', 'i8'), ('timestamp', 'i8'), ('temperature', 'f8'), ('humidity', 'f8')),
+    'environment': (('packet', 'i8'), ('temperature', 'f8'), ('humidity', 'f8'),
+                    ('illumination', 'i8'), ('motion', '?')),
+    'location_gnss': (('packet', 'i8'), ('latitude', 'f8'), ('longitude', 'f8')),
+    'device_status': (('packet', 'i8'), ('battery', 'u1'), ('rssi', 'u1')),
+    'steps': (('packet', 'i8'), ('steps', 'i4')),
+    'errors': (('index', 'i8'), ('error', 'U')),
+}
+
+
+def _check_len(dlen, size):
+    if dlen < size:
+        raise ValueError(f"Data item too short: {dlen} < {size} bytes")
+
+
+def _add_multi(cols, chunks, pidx, buf, offset, dlen):
+    _check_len(dlen, MULTI_HEAD.size)
+    first_ts, interval, count = MULTI_HEAD.unpack_from(buf, offset)
+    _check_len(dlen, MULTI_HEAD.size + MULTI_RECORD.size * count)
+    if chunks is not None:
+        # NumPy mode: remember where the records are, convert all of them at the end
+        chunks.append((pidx, first_ts, interval, count, buf, offset + MULTI_HEAD.size))
+        return
+    values = multi_records_struct(count).unpack_from(buf, offset + MULTI_HEAD.size)
+    t = cols['multi']
+    t['packet'].extend([pidx] * count)
+    t['timestamp'].extend(range(first_ts, first_ts + interval * count, interval) if interval
+                          else [first_ts] * count)
+    t['temperature'].extend([v / 10 for v in values[0::2]])
+    t['humidity'].extend([v / 10 for v in values[1::2]])
+
+
+def _add_environment(cols, chunks, pidx, buf, offset, dlen):
+    _check_len(dlen, ENVIRONMENT.size)
+    temperature, humidity, illumination, motion = ENVIRONMENT.unpack_from(buf, offset)
+    t = cols['environment']
+    t['packet'].append(pidx)
+    t['temperature'].append(temperature / 10)
+    t['humidity'].append(humidity / 10)
+    t['illumination'].append(illumination)
+    t['motion'].append(bool(motion))
+
+
+def _add_location(cols, chunks, pidx, buf, offset, dlen):
+    # Only GNSS fixes are columnar; CELL locations are skipped
+    if dlen < 1 or buf[offset] != DataLocation.TYPE_GNSS:
+        return
+    _check_len(dlen, GNSS.size)
+    _, latitude, longitude = GNSS.unpack_from(buf, offset)
+    t = cols['location_gnss']
+    t['packet'].append(pidx)
+    t['latitude'].append(latitude)
+    t['longitude'].append(longitude)
+
+
+def _add_device_status(cols, chunks, pidx, buf, offset, dlen):
+    _check_len(dlen, DEVICE_STATUS.size)
+    battery, rssi = DEVICE_STATUS.unpack_from(buf, offset)
+    t = cols['device_status']
+    t['packet'].append(pidx)
+    t['battery'].append(battery)
+    t['rssi'].append(rssi)
+
+
+def _add_steps(cols, chunks, pidx, buf, offset, dlen):
+    _check_len(dlen, STEPS.size)
+    steps, = STEPS.unpack_from(buf, offset)
+    t = cols['steps']
+    t['packet'].append(pidx)
+    t['steps'].append(steps)
+
+
+# (type, version) -> column appender; other items are skipped
+_ITEM_HANDLERS = DataRegistry()
+_ITEM_HANDLERS.register(TYPE_MULTI, 1, _add_multi)
+_ITEM_HANDLERS.register(TYPE_ENVIRONMENT, 1, _add_environment)
+_ITEM_HANDLERS.register(TYPE_LOCATION, 1, _add_location)
+_ITEM_HANDLERS.register(TYPE_DEVICE_STATUS, 1, _add_device_status)
+_ITEM_HANDLERS.register(TYPE_STEPS, 1, _add_steps)
+
+
+def _decode_one(cols, chunks, buf):
+    version, command, txn_id, imei_bytes, timestamp, offset = parse_header(buf)
+    end = len(buf)
+
+    p = cols['packets']
+    pidx = len(p['imei'])
+    p['imei'].append(Packet._decode_imei_bcd(imei_bytes))
+    p['command'].append(command.rstrip('\0'))
+    p['txn_id'].append(txn_id)
+    p['timestamp'].append(timestamp)
+
+    if command != 'T\0' or offset >= end:  # only Telemetry carries data items
+        return
+    handlers = _ITEM_HANDLERS.get
+    count = buf[offset]
+    offset += 1
+    for _ in range(count):
+        dtype, dver, dlen = ITEM_HEADER.unpack_from(buf, offset)
+        offset += ITEM_HEADER.size
+        if offset + dlen > end:
+            raise ValueError(f"Not enough data to read data item of length {dlen}")
+        handler = handlers(dtype, dver)
+        if handler is not None:
+            handler(cols, chunks, pidx, buf, offset, dlen)
+        offset += dlen
+
+
+def _multi_chunks_to_numpy(np, chunks):
+    dtype = np.dtype([('temperature', '>i2'), ('humidity', '>i2')])
+    if not chunks:
+        empty = np.empty(0)
+        return {'packet': empty.astype('i8'), 'timestamp': empty.astype('i8'),
+                'temperature': empty, 'humidity': empty}
+    counts = np.array([c[3] for c in chunks], dtype=np.int64)
+    records = np.concatenate([
+        np.frombuffer(buf, dtype=dtype, count=count, offset=offset)
+        for _, _, _, count, buf, offset in chunks
+    ])
+    starts = np.repeat(np.cumsum(counts) - counts, counts)
+    within = np.arange(len(records), dtype=np.int64) - starts
+    first_ts = np.repeat(np.array([c[1] for c in chunks], dtype=np.int64), counts)
+    interval = np.repeat(np.array([c[2] for c in chunks], dtype=np.int64), counts)
+    return {
+        'packet': np.repeat(np.array([c[0] for c in chunks], dtype=np.int64), counts),
+        'timestamp': first_ts + interval * within,
+        'temperature': records['temperature'] / 10,
+        'humidity': records['humidity'] / 10,
+    }
+
+
+def decode_batch(datagrams, as_numpy: bool = False):
+    """
+    Decode an iterable of datagrams (bytes, bytearray or memoryview) into columnar tables.
+
+    Returns a dict of tables (see TABLES), each a dict of column name -> list, or
+    NumPy arrays when ``as_numpy`` is True (requires numpy):
+      - packets: imei, command, txn_id, timestamp (one row per decoded packet)
+      - multi: packet, timestamp, temperature, humidity (one row per sample, timestamps expanded)
+      - environment, location_gnss, device_status, steps: packet + item fields
+      - errors: index (position in ``datagrams``), error message for malformed packets
+
+    Malformed packets contribute no rows except in 'errors'. In NumPy mode the Multi records
+    are read from the datagram buffers at the end, so reused buffers must not be overwritten
+    before decode_batch returns.
+    """
+    np = require_numpy() if as_numpy else None
+    cols = {table: {name: [] for name, _ in columns} for table, columns in TABLES.items()}
+    chunks = [] if as_numpy else None
+    tables = [cols[name] for name in TABLES if name != 'errors']
+    errors = cols['errors']
+    for index, datagram in enumerate(datagrams):
+        buf = memoryview(datagram)
+        marks = [len(next(iter(t.values()))) for t in tables]
+        chunk_mark = len(chunks) if chunks is not None else 0
+        try:
+            _decode_one(cols, chunks, buf)
+        except (ValueError, struct.error, IndexError) as e:
+            # Roll back any rows this packet already appended
+            for t, mark in zip(tables, marks):
+                for col in t.values():
+                    del col[mark:]
+            if chunks is not None:
+                del chunks[chunk_mark:]
+            errors['index'].append(index)
+            errors['error'].append(str(e))
+
+    if not as_numpy:
+        return cols
+    result = {}
+    for table, columns in TABLES.items():
+        if table == 'multi':
+            result[table] = _multi_chunks_to_numpy(np, chunks)
+            continue
+        result[table] = {name: np.array(cols[table][name], dtype=dt) for name, dt in columns}
+    return result
+
+
+__all__ = ['decode_batch', 'TABLES']
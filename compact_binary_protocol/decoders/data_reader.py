@@ -1,3 +1,6 @@
+from ..encodings.kv import KV_CACHE
+
+
 class DataReader:
     """Sequential reader for bytes with big-endian decode helpers.
 
@@ -82,26 +85,14 @@ class DataReader:
 
     # ---- KV decoding helpers ----
     @staticmethod
-    def parse_kv_payload(payload: bytes):
+    def parse_kv_payload(payload: bytes, strict: bool = False):
         """Parse a DataKv payload (count + key/value VarStrings).
-        Returns a list of (key, value) tuples.
+        Returns a list of (key, value) tuples; a truncated payload yields the pairs before
+        the truncation, or raises ValueError with ``strict=True``. Repeated payloads are
+        served from KV_CACHE.
         """
-        r = DataReader(payload)
-        pairs = []
-        try:
-            cnt = r.read_u8() if r.remaining() > 0 else 0
-            for _ in range(cnt):
-                k = r.read_var_string()
-                v = r.read_var_string()
-                pairs.append((k, v))
-        except IndexError:
-            # Truncate on malformed payload
-            pass
-        return pairs
+        return list(KV_CACHE.decode_pairs(payload, strict))
 
     @staticmethod
     def kv_pairs_to_dict(pairs):
-        d = {}
-        for k, v in pairs:
-            d[k] = v
-        return d
+        return dict(pairs)
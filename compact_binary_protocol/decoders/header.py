@@ -0,0 +1,63 @@
+"""
+Header-only fast path.
+
+parse_header() reads the whole common header with a single Struct.unpack_from call (one
+precompiled Struct per IMEI length, 8 being the usual one), without touching the body.
+build_ack() turns a parsed header into the matching "A\\0" packet, reusing the incoming
+IMEI bytes verbatim instead of decoding and re-encoding the BCD.
+"""
+import struct
+import time
+
+# Whole-header Structs indexed by IMEI length, shared with the encoders
+from ..encodings.codec import HEADER_STRUCTS as _HEADERS, header_struct
+
+_COMMANDS = {}
+_ACK_COMMAND = b'A\x00'
+
+
+def _command_str(cmd: bytes) -> str:
+    command = _COMMANDS.get(cmd)
+    if command is None:
+        command = _COMMANDS[cmd] = cmd.decode('latin-1')
+    return command
+
+
+header_struct(8)
+
+
+def parse_header(buf):
+    """
+    Parse the common header of a packet in bytes, bytearray or memoryview.
+
+    Returns (version, command, transaction_id, imei_bytes, timestamp, body_offset) where
+    command is the 2-character string (e.g. 'T\\0') and imei_bytes the packed-BCD IMEI.
+    Raises ValueError if the buffer is shorter than the header.
+    """
+    try:
+        s = _HEADERS[buf[5]] or header_struct(buf[5])
+        version, cmd, txn_id, _, imei_bytes, timestamp = s.unpack_from(buf, 0)
+    except (IndexError, struct.error) as e:
+        raise ValueError(f"Malformed packet header: {e}") from e
+    command = _COMMANDS.get(cmd) or _command_str(cmd)
+    return version, command, txn_id, imei_bytes, timestamp, s.size
+
+
+def build_ack(header, timestamp: int | None = None) -> bytes:
+    """
+    Build the "A\\0" packet acknowledging a packet whose parse_header() result is ``header``:
+    same version, transaction ID and IMEI bytes, timestamp ``timestamp`` (default: now).
+    """
+    version, _, txn_id, imei_bytes, _, _ = header
+    if timestamp is None:
+        timestamp = int(time.time())
+    s = _HEADERS[len(imei_bytes)] or header_struct(len(imei_bytes))
+    return s.pack(version, _ACK_COMMAND, txn_id, len(imei_bytes), imei_bytes, timestamp)
+
+
+def ack_for(buf, timestamp: int | None = None) -> bytes:
+    """Build the Ack for a raw packet directly from its header bytes."""
+    return build_ack(parse_header(buf), timestamp)
+
+
+__all__ = ['parse_header', 'build_ack', 'ack_for']
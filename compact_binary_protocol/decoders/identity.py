@@ -0,0 +1,111 @@
+"""
+Per-device dedup of startup identity items.
+
+Devices send DataCustomerId, DataVersions and DataNetworkInfo on every boot, and the
+payloads almost never change. IdentityCache keeps the last payload bytes of those items per
+IMEI and compares incoming payloads against them before decoding: an identical payload is
+returned as the UNCHANGED marker without building a Data object, so only real changes reach
+downstream writers. Entries are bounded (LRU by device) and expire ``ttl`` seconds after
+they were created, so every device is re-emitted in full at least once per ttl.
+"""
+import time
+from collections import OrderedDict
+
+from ..data.constants import TYPE_CUSTOMER_ID, TYPE_NETWORK_INFO, TYPE_VERSIONS
+
+IDENTITY_TYPES = frozenset((TYPE_CUSTOMER_ID, TYPE_VERSIONS, TYPE_NETWORK_INFO))
+
+
+class _Unchanged:
+    __slots__ = ()
+
+    def __repr__(self):
+        return 'UNCHANGED'
+
+    def __bool__(self):
+        return False
+
+
+# Returned in place of an identity item whose payload matches the cached one
+UNCHANGED = _Unchanged()
+
+
+class IdentityCache:
+    """
+    Last identity payloads per device, keyed by IMEI (str or the wire IMEI bytes, e.g.
+    PacketView.imei_bytes, which avoids the BCD decode; use one form consistently).
+
+    At most ``maxsize`` devices are kept; the least recently seen device is evicted.
+    ``types`` are the sensor types compared (default IDENTITY_TYPES); other items are always
+    decoded. ``maxsize=0`` disables caching (every item counts as changed).
+    """
+    def __init__(self, maxsize: int = 1048576, ttl: float = 86400.0, types=IDENTITY_TYPES, clock=time.monotonic):
+        self.ttl = ttl
+        self.types = frozenset(types)
+        self._clock = clock
+        self.resize(maxsize)
+
+    def resize(self, maxsize: int):
+        """Change the bound; this drops all cached devices and resets the stats."""
+        self.maxsize = maxsize
+        self._devices = OrderedDict()  # imei -> (expires, {(type, version): payload bytes})
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+
+    def _payloads(self, imei):
+        devices = self._devices
+        entry = devices.get(imei)
+        now = self._clock()
+        if entry is not None and entry[0] <= now:
+            del devices[imei]
+            self.expired += 1
+            entry = None
+        if entry is None:
+            entry = devices[imei] = (now + self.ttl, {})
+            if len(devices) > self.maxsize:
+                devices.popitem(last=False)
+        else:
+            devices.move_to_end(imei)
+        return entry[1]
+
+    def decode(self, imei, item):
+        """Decoded value of an ItemView, or UNCHANGED if it is an identity item with the same
+        payload as last time for this device."""
+        if item.sensor_type not in self.types or self.maxsize == 0:
+            return item.value
+        payloads = self._payloads(imei)
+        key = (item.sensor_type, item.sensor_version)
+        payload = item.payload
+        if payloads.get(key) == payload:
+            self.hits += 1
+            return UNCHANGED
+        # Decode before storing so a malformed payload is not remembered as current
+        value = item.value
+        payloads[key] = bytes(payload)
+        self.misses += 1
+        return value
+
+    def decode_items(self, view) -> list:
+        """Values of every item of a PacketView, with UNCHANGED in place of repeated identity items."""
+        imei = view.imei_bytes
+        return [self.decode(imei, item) for item in view.items]
+
+    def changes(self, view) -> list:
+        """Decoded items of a PacketView, leaving out repeated identity items."""
+        imei = view.imei_bytes
+        return [value for value in (self.decode(imei, item) for item in view.items) if value is not UNCHANGED]
+
+    def evict(self, imei):
+        """Forget a device, so its next identity items are emitted in full."""
+        self._devices.pop(imei, None)
+
+    def clear(self):
+        self._devices.clear()
+
+    def stats(self) -> dict:
+        return {'hits': self.hits, 'misses': self.misses, 'expired': self.expired,
+                'devices': len(self._devices), 'maxsize': self.maxsize}
+
+
+__all__ = ['IdentityCache', 'IDENTITY_TYPES', 'UNCHANGED']
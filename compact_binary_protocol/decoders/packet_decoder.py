@@ -1,3 +1,14 @@
+import struct
+
+from ..data import DataKv
+from ..data.constants import TYPE_KV
+from ..encodings.codec import ITEM_HEADER
+from ..encodings.kv import KV_CACHE
+from ..packets import Packet, TelemetryPacket, ConfigPacket, RawPacket, AckPacket
+from .header import parse_header
+from .registry import DATA_REGISTRY
+
+
 class PacketDecoder:
     """Utility class for decoding compact-binary packets."""
 
@@ -33,20 +44,135 @@ class PacketDecoder:
     @staticmethod
     def decode_packet_header(hex_str):
         """
-        Decode the packet header from a hex string.
+        Decode the start of the packet header from a hex string.
         Header format: <ver><cmd1><cmd2><txnId><imeiLen><imeiBCD...><timestamp u32>
-        Returns tuple: (version, command, transaction_id, timestamp, remainder_bytes) or (None, None, None) on error.
+        Returns tuple: (version, command, transaction_id, remainder_bytes), where remainder_bytes
+        starts at imeiLen, or (None, None, None, None) if the input is not hex or is shorter than 5 bytes.
         """
         try:
             data = bytes.fromhex(hex_str)
-            if len(data) < 5:
-                return (None, None, None)
-            version = data[0]
-            cmd1 = chr(data[1]) if len(data) > 1 else '\0'
-            cmd2 = chr(data[2]) if len(data) > 2 else '\0'
-            command = cmd1 + cmd2
-            txn_id = int.from_bytes(data[3:5], byteorder='big')
-            data = data[5:]
-            return (version, command, txn_id, data)
-        except Exception:
-            return (None, None, None)
+        except ValueError:
+            return (None, None, None, None)
+        if len(data) < 5:
+            return (None, None, None, None)
+        version = data[0]
+        command = chr(data[1]) + chr(data[2])
+        txn_id = int.from_bytes(data[3:5], byteorder='big')
+        return (version, command, txn_id, data[5:])
+
+    @staticmethod
+    def decode_packet(buf):
+        """
+        Decode a complete packet from bytes, bytearray or memoryview.
+
+        The datagram is walked once through a memoryview: the full header (including IMEI
+        and timestamp) is parsed, then the body is decoded according to the command.
+        Telemetry data items are dispatched on (type, version) via DATA_REGISTRY; items of
+        unknown type/version are returned as DataRaw.
+
+        A 'C' body is either raw key/value pairs (server request, ConfigPacket.to_bytes) or a
+        device reply carrying DataKv items (see ConfigPacket.decode); both give a ConfigPacket.
+
+        Returns TelemetryPacket for 'T', ConfigPacket for 'C'/'W', AckPacket for 'A' and RawPacket otherwise.
+        Raises ValueError if the packet is truncated or malformed.
+        """
+        return _decode(buf)
+
+
+def _decode_packet(buf):
+    mv = memoryview(buf)
+    version, command, txn_id, imei_bytes, timestamp, offset = parse_header(mv)
+    imei = Packet._decode_imei_bcd(imei_bytes)
+    try:
+        body_decoder = _BODY_DECODERS.get(command, _decode_raw_body)
+        return body_decoder(command, version, txn_id, imei, timestamp, mv[offset:])
+    except (struct.error, IndexError, UnicodeDecodeError) as e:
+        raise ValueError(f"Malformed packet: {e}") from e
+
+
+# Implementation behind decode_packet(); metrics.enable() swaps in an instrumented one
+_decode = _decode_packet
+
+
+def _decode_data_items(body):
+    """Decode a Telemetry body [count u8][items...] into a list of Data objects."""
+    items = []
+    if len(body) == 0:
+        return items
+    decode = DATA_REGISTRY.decode
+    count = body[0]
+    offset = 1
+    end = len(body)
+    for _ in range(count):
+        dtype, dver, dlen = ITEM_HEADER.unpack_from(body, offset)
+        offset += ITEM_HEADER.size
+        if offset + dlen > end:
+            raise ValueError(f"Not enough data to read data item of length {dlen}")
+        items.append(decode(dtype, dver, body[offset:offset + dlen]))
+        offset += dlen
+    return items
+
+
+def _decode_telemetry_body(command, version, txn_id, imei, timestamp, body):
+    packet = TelemetryPacket(imei, timestamp, txn_id, command, _decode_data_items(body))
+    packet.version = version
+    return packet
+
+
+def is_kv_item_body(body) -> bool:
+    """
+    True if a 'C' body is [count][data items...] starting with a DataKv item (a device reply)
+    rather than a raw KV payload. The item lengths must account for the whole body, so raw
+    pairs are only mistaken for items if the first key is the single character '\x01'.
+    """
+    end = len(body)
+    if end < 1 + ITEM_HEADER.size or body[0] == 0:
+        return False
+    dtype, dver, dlen = ITEM_HEADER.unpack_from(body, 1)
+    if dtype != TYPE_KV or dver != DataKv.sensor_version:
+        return False
+    pos = 1
+    for _ in range(body[0]):
+        if pos + ITEM_HEADER.size > end:
+            return False
+        pos += ITEM_HEADER.size + ITEM_HEADER.unpack_from(body, pos)[2]
+    return pos == end
+
+
+def kv_item_pairs(items) -> list:
+    """Pairs of all DataKv items in a decoded 'C' reply, in order."""
+    pairs = []
+    for item in items:
+        if isinstance(item, DataKv):
+            pairs.extend(item.pairs)
+    return pairs
+
+
+def _decode_config_body(command, version, txn_id, imei, timestamp, body):
+    packet = ConfigPacket(imei, (), txn_id, command)
+    # Decoded pairs are already (str, str); skip the constructor's normalization
+    if command == 'C\0' and is_kv_item_body(body):
+        packet.pairs = kv_item_pairs(_decode_data_items(body))
+    else:
+        packet.pairs = list(KV_CACHE.decode_pairs(body))
+    packet.version = version
+    packet.timestamp = timestamp
+    return packet
+
+
+def _decode_ack_body(command, version, txn_id, imei, timestamp, body):
+    return AckPacket(imei, txn_id, timestamp, version)
+
+
+def _decode_raw_body(command, version, txn_id, imei, timestamp, body):
+    return RawPacket(command, imei, txn_id, body, version, timestamp=timestamp)
+
+
+_BODY_DECODERS = {
+    'T\0': _decode_telemetry_body,
+    'C\0': _decode_config_body,
+    'W\0': _decode_config_body,
+    'A\0': _decode_ack_body,
+}
+
+decode_packet = PacketDecoder.decode_packet
@@ -0,0 +1,144 @@
+"""
+Registry of data item codecs keyed by (type, version).
+
+Types and versions are both u8, so lookups are two list indexings instead of a dict probe
+or a chain of if checks: ``table[type]`` is None or a 256-entry list indexed by version.
+A codec is a Data class with a ``from_payload(payload)`` classmethod, or a plain callable
+taking the payload. Custom types register with the decorator:
+
+    @register_data_type(200, 1)
+    class DataPressure:
+        ...
+        @classmethod
+        def from_payload(cls, payload):
+            ...
+"""
+from ..data import (
+    DataLocation,
+    DataEnvironment,
+    DataMulti,
+    DataNull,
+    DataSteps,
+    DataVersions,
+    DataNetworkInfo,
+    DataCustomerId,
+    DataDeviceStatus,
+    DataKv,
+    DataRaw,
+)
+from ..data.constants import (
+    TYPE_NULL,
+    TYPE_KV,
+    TYPE_LOCATION,
+    TYPE_CUSTOMER_ID,
+    TYPE_VERSIONS,
+    TYPE_NETWORK_INFO,
+    TYPE_DEVICE_STATUS,
+    TYPE_ENVIRONMENT,
+    TYPE_MULTI,
+    TYPE_STEPS,
+)
+
+
+def _check_u8(name, value):
+    if not 0 <= value <= 255:
+        raise ValueError(f"{name} must be 0..255, got {value}")
+
+
+class DataRegistry:
+    """(type, version) -> codec table with O(1) list-indexed dispatch."""
+
+    def __init__(self):
+        self._decoders = [None] * 256  # type -> None | [decode callable or None] * 256
+        self._codecs = {}
+        self._wrapper = None
+        self._unknown = DataRaw
+
+    def register(self, sensor_type: int, sensor_version: int, codec=None, *, replace: bool = False):
+        """
+        Register ``codec`` for (sensor_type, sensor_version). Without ``codec``, returns a
+        decorator registering the decorated class or function. Registering a pair twice
+        raises ValueError unless ``replace`` is True.
+        """
+        if codec is None:
+            def decorator(obj):
+                self.register(sensor_type, sensor_version, obj, replace=replace)
+                return obj
+            return decorator
+        _check_u8('sensor_type', sensor_type)
+        _check_u8('sensor_version', sensor_version)
+        key = (sensor_type, sensor_version)
+        if key in self._codecs and not replace:
+            raise ValueError(f"Data type {sensor_type} version {sensor_version} is already registered")
+        row = self._decoders[sensor_type]
+        if row is None:
+            row = self._decoders[sensor_type] = [None] * 256
+        decoder = getattr(codec, 'from_payload', codec)
+        if self._wrapper is not None:
+            decoder = self._wrapper(key, decoder)
+        row[sensor_version] = decoder
+        self._codecs[key] = codec
+        return codec
+
+    def unregister(self, sensor_type: int, sensor_version: int):
+        """Remove a registration; unknown pairs are ignored."""
+        if self._codecs.pop((sensor_type, sensor_version), None) is not None:
+            self._decoders[sensor_type][sensor_version] = None
+
+    def get(self, sensor_type: int, sensor_version: int):
+        """Decode callable for (sensor_type, sensor_version), or None."""
+        row = self._decoders[sensor_type]
+        return row[sensor_version] if row is not None else None
+
+    def codec(self, sensor_type: int, sensor_version: int):
+        """The registered class or callable for (sensor_type, sensor_version), or None."""
+        return self._codecs.get((sensor_type, sensor_version))
+
+    def decode(self, sensor_type: int, sensor_version: int, payload):
+        """Decode an item payload; unregistered pairs are returned as DataRaw."""
+        row = self._decoders[sensor_type]
+        decoder = row[sensor_version] if row is not None else None
+        if decoder is None:
+            return self._unknown(sensor_type, sensor_version, payload)
+        return decoder(payload)
+
+    def instrument(self, wrapper=None, unknown=None):
+        """
+        Swap every decode callable for ``wrapper((type, version), decoder)`` and the DataRaw
+        fallback for ``unknown``; with no arguments the plain callables are restored.
+        Used by metrics.enable()/disable(), so undecorated dispatch pays nothing.
+        """
+        self._wrapper = wrapper
+        self._unknown = unknown or DataRaw
+        for (sensor_type, sensor_version), codec in self._codecs.items():
+            decoder = getattr(codec, 'from_payload', codec)
+            if wrapper is not None:
+                decoder = wrapper((sensor_type, sensor_version), decoder)
+            self._decoders[sensor_type][sensor_version] = decoder
+
+    def __contains__(self, key):
+        return key in self._codecs
+
+    def __len__(self):
+        return len(self._codecs)
+
+    def items(self):
+        """((type, version), codec) pairs in registration order."""
+        return self._codecs.items()
+
+
+DATA_REGISTRY = DataRegistry()
+register_data_type = DATA_REGISTRY.register
+
+register_data_type(TYPE_NULL, 0, DataNull)
+register_data_type(TYPE_KV, 1, DataKv)
+register_data_type(TYPE_LOCATION, 1, DataLocation)
+register_data_type(TYPE_CUSTOMER_ID, 1, DataCustomerId)
+register_data_type(TYPE_VERSIONS, 1, DataVersions)
+register_data_type(TYPE_NETWORK_INFO, 1, DataNetworkInfo)
+register_data_type(TYPE_DEVICE_STATUS, 1, DataDeviceStatus)
+register_data_type(TYPE_ENVIRONMENT, 1, DataEnvironment)
+register_data_type(TYPE_MULTI, 1, DataMulti)
+register_data_type(TYPE_STEPS, 1, DataSteps)
+
+__all__ = ['DataRegistry', 'DATA_REGISTRY', 'register_data_type']
@@ -0,0 +1,188 @@
+"""
+Validating decoder that reports malformed packets without raising.
+
+ValidatingDecoder.decode() checks the structure of a datagram in one pass before decoding
+anything: the header against the declared IMEI length, the Telemetry item count against
+the items actually present, each declared item length against the remaining bytes, KV
+string lengths of Config bodies (or the data items of a DataKv-wrapped C reply), and
+leftover bytes after the body. A malformed datagram
+comes back as an InvalidPacket (error code + byte offset) instead of an exception, so junk
+traffic is rejected after a few index checks. Only an item payload rejected by its own
+decoder (e.g. a 2-byte DataSteps) still goes through an exception internally, reported as
+E_PAYLOAD, or as E_ENCODING for a non-ASCII string (a Config pair or a string inside a data
+item such as DataKv). Counters per error class are kept on the decoder (stats()).
+"""
+import struct
+
+from ..encodings.codec import ITEM_HEADER, header_struct
+from ..encodings.kv import KV_CACHE
+from ..packets import Packet, TelemetryPacket, ConfigPacket, RawPacket, AckPacket
+from .header import parse_header
+from .packet_decoder import is_kv_item_body, kv_item_pairs
+from .registry import DATA_REGISTRY
+
+OK = 0
+E_SHORT_HEADER = 1   # datagram shorter than the header with its declared IMEI length
+E_MISSING_COUNT = 2  # Telemetry/Config write body without its count byte
+E_ITEM_COUNT = 3     # body ends before the declared number of items/pairs
+E_ITEM_HEADER = 4    # data item header cut off
+E_ITEM_LENGTH = 5    # declared item/string length runs past the end of the body
+E_TRAILING = 6       # bytes left after the last item (or after an Ack header)
+E_PAYLOAD = 7        # item payload rejected by its decoder
+E_ENCODING = 8       # non-ASCII string (KV pair or string field of a data item)
+
+ERROR_NAMES = ('ok', 'short_header', 'missing_count', 'item_count', 'item_header', 'item_length',
+               'trailing', 'payload', 'encoding')
+
+_HEADER_SIZE = header_struct(0).size  # header without the IMEI bytes
+_ITEM_HEADER_SIZE = ITEM_HEADER.size
+_CONFIG_COMMANDS = ('C\0', 'W\0')
+
+
+class InvalidPacket:
+    """Result of decoding a malformed datagram: ``code`` (E_*), ``offset`` of the first bad byte
+    and ``command`` (None if the header itself is bad). Falsy, so ``if packet:`` skips it."""
+    __slots__ = ('code', 'offset', 'command')
+
+    def __init__(self, code: int, offset: int, command=None):
+        self.code = code
+        self.offset = offset
+        self.command = command
+
+    @property
+    def name(self) -> str:
+        return ERROR_NAMES[self.code]
+
+    def __bool__(self):
+        return False
+
+    def __repr__(self):
+        return f"InvalidPacket({self.name}, offset={self.offset}, command={self.command!r})"
+
+
+class ValidatingDecoder:
+    """
+    decode(buf) -> Packet or InvalidPacket. Produces the same packets as decode_packet() for
+    well-formed input; unlike decode_packet(), trailing bytes after the body are rejected
+    unless ``allow_trailing`` is set, and KV payloads are always decoded with ``strict=True``.
+    Usable as ``CompactBinaryServer(decoder=ValidatingDecoder().decode)``.
+    """
+    def __init__(self, registry=DATA_REGISTRY, allow_trailing: bool = False):
+        self.registry = registry
+        self.allow_trailing = allow_trailing
+        self.reset()
+
+    def reset(self):
+        self.decoded = 0
+        self.errors = [0] * len(ERROR_NAMES)
+
+    def _invalid(self, code, offset, command=None):
+        self.errors[code] += 1
+        return InvalidPacket(code, offset, command)
+
+    def _decode_items(self, mv, offset, end, command):
+        """Decode [count][data items...] at ``offset``; returns the items or an InvalidPacket."""
+        # Pass 1: item spans, lengths only
+        count = mv[offset]
+        pos = offset + 1
+        spans = []
+        for _ in range(count):
+            if pos >= end:
+                return self._invalid(E_ITEM_COUNT, pos, command)
+            if pos + _ITEM_HEADER_SIZE > end:
+                return self._invalid(E_ITEM_HEADER, pos, command)
+            dtype, dver, dlen = ITEM_HEADER.unpack_from(mv, pos)
+            start = pos + _ITEM_HEADER_SIZE
+            pos = start + dlen
+            if pos > end:
+                return self._invalid(E_ITEM_LENGTH, start - _ITEM_HEADER_SIZE, command)
+            spans.append((dtype, dver, start, pos))
+        if pos != end and not self.allow_trailing:
+            return self._invalid(E_TRAILING, pos, command)
+        # Pass 2: decode payloads
+        decode = self.registry.decode
+        items = []
+        for dtype, dver, start, stop in spans:
+            try:
+                items.append(decode(dtype, dver, mv[start:stop]))
+            except UnicodeDecodeError:
+                return self._invalid(E_ENCODING, start - _ITEM_HEADER_SIZE, command)
+            except (ValueError, struct.error, IndexError):
+                return self._invalid(E_PAYLOAD, start - _ITEM_HEADER_SIZE, command)
+        return items
+
+    def decode(self, buf):
+        mv = memoryview(buf)
+        end = len(mv)
+        if end < _HEADER_SIZE or end < _HEADER_SIZE + mv[5]:
+            return self._invalid(E_SHORT_HEADER, min(end, 5))
+        version, command, txn_id, imei_bytes, timestamp, offset = parse_header(mv)
+        imei = Packet._decode_imei_bcd(imei_bytes)
+
+        if command == 'T\0':
+            if offset >= end:
+                return self._invalid(E_MISSING_COUNT, offset, command)
+            items = self._decode_items(mv, offset, end, command)
+            if isinstance(items, InvalidPacket):
+                return items
+            packet = TelemetryPacket(imei, timestamp, txn_id, command, items)
+            packet.version = version
+
+        elif command in _CONFIG_COMMANDS:
+            if offset >= end:
+                if command != 'C\0':
+                    return self._invalid(E_MISSING_COUNT, offset, command)
+                pairs = ()  # a server->device config request has an empty body
+            elif command == 'C\0' and is_kv_item_body(mv[offset:]):
+                items = self._decode_items(mv, offset, end, command)
+                if isinstance(items, InvalidPacket):
+                    return items
+                pairs = kv_item_pairs(items)
+            else:
+                count = mv[offset]
+                pos = offset + 1
+                for _ in range(count * 2):
+                    if pos >= end:
+                        return self._invalid(E_ITEM_COUNT, pos, command)
+                    next_pos = pos + 1 + mv[pos]
+                    if next_pos > end:
+                        return self._invalid(E_ITEM_LENGTH, pos, command)
+                    pos = next_pos
+                if pos != end and not self.allow_trailing:
+                    return self._invalid(E_TRAILING, pos, command)
+                # Lengths are valid at this point, so decoding can only fail on non-ASCII strings
+                try:
+                    pairs = KV_CACHE.decode_pairs(mv[offset:pos], strict=True)
+                except ValueError:
+                    return self._invalid(E_ENCODING, offset, command)
+            packet = ConfigPacket(imei, (), txn_id, command)
+            packet.pairs = list(pairs)
+            packet.version = version
+            packet.timestamp = timestamp
+
+        elif command == 'A\0':
+            if offset != end and not self.allow_trailing:
+                return self._invalid(E_TRAILING, offset, command)
+            packet = AckPacket(imei, txn_id, timestamp, version)
+
+        else:
+            packet = RawPacket(command, imei, txn_id, mv[offset:], version, timestamp=timestamp)
+
+        self.decoded += 1
+        return packet
+
+    __call__ = decode
+
+    def stats(self) -> dict:
+        """{'decoded': n, '<error name>': n, ...} for every error class."""
+        result = {'decoded': self.decoded}
+        for code in range(1, len(ERROR_NAMES)):
+            result[ERROR_NAMES[code]] = self.errors[code]
+        return result
+
+
+__all__ = [
+    'ValidatingDecoder', 'InvalidPacket', 'ERROR_NAMES',
+    'OK', 'E_SHORT_HEADER', 'E_MISSING_COUNT', 'E_ITEM_COUNT', 'E_ITEM_HEADER', 'E_ITEM_LENGTH',
+    'E_TRAILING', 'E_PAYLOAD', 'E_ENCODING',
+]
@@ -0,0 +1,153 @@
+"""
+Lazy, zero-copy view over a raw packet.
+
+PacketView parses nothing up front: header fields are unpacked on first access, data items
+are indexed (type, version, offset, length) on first iteration, and an item payload is only
+decoded into a Data* object when its ``value`` is read. Routers can read command, IMEI and
+timestamp from the first ~18 bytes and forward ``view.raw`` untouched.
+"""
+import struct
+
+from ..encodings.codec import ITEM_HEADER
+from ..packets import Packet
+from .header import parse_header
+from .registry import DATA_REGISTRY
+
+
+class ItemView:
+    """One data item inside a PacketView; ``value`` decodes the payload on first access."""
+    __slots__ = ('sensor_type', 'sensor_version', 'offset', 'length', '_buf', '_value')
+
+    def __init__(self, buf, sensor_type, sensor_version, offset, length):
+        self._buf = buf
+        self.sensor_type = sensor_type
+        self.sensor_version = sensor_version
+        self.offset = offset
+        self.length = length
+        self._value = None
+
+    @property
+    def payload(self):
+        """Item payload as a memoryview into the packet."""
+        return self._buf[self.offset:self.offset + self.length]
+
+    @property
+    def value(self):
+        """Decoded Data* object (DataRaw for unknown type/version)."""
+        if self._value is None:
+            try:
+                self._value = DATA_REGISTRY.decode(self.sensor_type, self.sensor_version, self.payload)
+            except (struct.error, IndexError, UnicodeDecodeError) as e:
+                raise ValueError(f"Malformed data item type {self.sensor_type}: {e}") from e
+        return self._value
+
+    def to_bytes(self):
+        """The item exactly as it appears on the wire (header + payload)."""
+        return bytes(self._buf[self.offset - ITEM_HEADER.size:self.offset + self.length])
+
+
+class PacketView:
+    """
+    Lazy view over a packet in bytes, bytearray or memoryview.
+
+    Header: version, command, transaction_id, imei_bytes, imei, timestamp, body_offset.
+    Body: items (list of ItemView, indexed on first access; Telemetry only) and body.
+    ``raw`` is the original buffer; to_packet() fully decodes it with decode_packet().
+    Accessing a field of a malformed packet raises ValueError.
+    """
+    __slots__ = ('raw', '_header', '_imei', '_items')
+
+    def __init__(self, buf):
+        self.raw = memoryview(buf)
+        self._header = None
+        self._imei = None
+        self._items = None
+
+    def _parse_header(self):
+        # (version, command, transaction_id, imei_bytes, timestamp, body_offset)
+        self._header = parse_header(self.raw)
+        return self._header
+
+    @property
+    def version(self) -> int:
+        return (self._header or self._parse_header())[0]
+
+    @property
+    def command(self) -> str:
+        return (self._header or self._parse_header())[1]
+
+    @property
+    def transaction_id(self) -> int:
+        return (self._header or self._parse_header())[2]
+
+    @property
+    def imei_bytes(self) -> bytes:
+        """Packed-BCD IMEI as it appears on the wire."""
+        return (self._header or self._parse_header())[3]
+
+    @property
+    def imei(self) -> str:
+        if self._imei is None:
+            self._imei = Packet._decode_imei_bcd(self.imei_bytes)
+        return self._imei
+
+    @property
+    def timestamp(self) -> int:
+        return (self._header or self._parse_header())[4]
+
+    @property
+    def header(self):
+        """The parse_header() tuple, e.g. for build_ack()."""
+        return self._header or self._parse_header()
+
+    @property
+    def body_offset(self) -> int:
+        return (self._header or self._parse_header())[5]
+
+    @property
+    def body(self):
+        return self.raw[self.body_offset:]
+
+    @property
+    def items(self):
+        """Data items of a Telemetry body, indexed (not decoded) on first access."""
+        if self._items is None:
+            self._items = self._index_items()
+        return self._items
+
+    def _index_items(self):
+        if self.command != 'T\0':
+            return []
+        buf = self.raw
+        offset = self.body_offset
+        end = len(buf)
+        if offset >= end:
+            return []
+        items = []
+        try:
+            count = buf[offset]
+            offset += 1
+            for _ in range(count):
+                dtype, dver, dlen = ITEM_HEADER.unpack_from(buf, offset)
+                offset += ITEM_HEADER.size
+                if offset + dlen > end:
+                    raise ValueError(f"Not enough data to read data item of length {dlen}")
+                items.append(ItemView(buf, dtype, dver, offset, dlen))
+                offset += dlen
+        except struct.error as e:
+            raise ValueError(f"Malformed packet body: {e}") from e
+        return items
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def data(self):
+        """Decode and return every data item (list of Data* objects)."""
+        return [item.value for item in self.items]
+
+    def to_packet(self):
+        from .packet_decoder import decode_packet
+        return decode_packet(self.raw)
+
+
+__all__ = ['PacketView', 'ItemView']
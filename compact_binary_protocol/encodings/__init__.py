@@ -1,3 +1,4 @@
-from .var_string import encode_var_string
+from .var_string import encode_var_string, decode_var_string
+from .bcd import encode_imei_bcd, decode_imei_bcd, BcdCache, IMEI_CACHE
 
-__all__ = ['encode_var_string']
+__all__ = ['encode_var_string', 'decode_var_string', 'encode_imei_bcd', 'decode_imei_bcd', 'BcdCache', 'IMEI_CACHE']
@@ -0,0 +1,91 @@
+"""
+Packed-BCD codec for device IDs (IMEI) with an optional bounded LRU cache.
+
+Packed BCD of a digit string is byte-for-byte its hex representation, so encoding and
+decoding go through the C-level bytes.fromhex()/bytes.hex() tables rather than a
+per-nibble Python loop.
+"""
+import re
+from functools import lru_cache
+
+_NON_DIGITS = re.compile(r'[^0-9]')
+
+# Device ID sent when the ID has no digits at all
+EMPTY_IMEI_BCD = b"\x00" * 8
+
+
+def encode_imei_bcd(device_id: str) -> bytes:
+    """
+    Encode the decimal digits of ``device_id`` as packed BCD (high nibble first).
+    Non-digit characters are ignored; an odd digit count gets a leading 0 nibble.
+    """
+    if device_id.isascii() and device_id.isdigit():
+        digits = device_id
+    else:
+        digits = _NON_DIGITS.sub('', device_id)
+    if not digits:
+        return EMPTY_IMEI_BCD
+    if len(digits) % 2 == 1:
+        digits = '0' + digits
+    return bytes.fromhex(digits)
+
+
+def decode_imei_bcd(data) -> str:
+    """
+    Decode packed BCD (bytes, bytearray or memoryview) to a digit string, dropping the
+    leading 0 nibble used to pad odd-length IMEIs.
+    """
+    digits = data.hex()
+    if digits.startswith('0'):
+        digits = digits[1:]
+    return digits
+
+
+class BcdCache:
+    """
+    Bounded LRU cache in front of encode_imei_bcd/decode_imei_bcd.
+
+    Fleets resend the same IMEIs constantly; caching returns the same bytes/str objects
+    for repeat devices. ``maxsize=None`` is unbounded and ``maxsize=0`` disables caching.
+    """
+    def __init__(self, maxsize: int | None = 65536):
+        self.resize(maxsize)
+
+    def resize(self, maxsize: int | None):
+        """Change the bound; this drops all cached entries and resets the stats."""
+        self.maxsize = maxsize
+        if maxsize == 0:
+            self.encode = encode_imei_bcd
+            self._decode = decode_imei_bcd
+        else:
+            self.encode = lru_cache(maxsize=maxsize)(encode_imei_bcd)
+            self._decode = lru_cache(maxsize=maxsize)(decode_imei_bcd)
+
+    def decode(self, data) -> str:
+        # Cache keys must be immutable and must not pin the caller's datagram buffer
+        if type(data) is not bytes:
+            data = bytes(data)
+        return self._decode(data)
+
+    def clear(self):
+        if self.maxsize != 0:
+            self.encode.cache_clear()
+            self._decode.cache_clear()
+
+    def stats(self) -> dict:
+        """Hit/miss counters and current size for the encode and decode caches."""
+        if self.maxsize == 0:
+            empty = {'hits': 0, 'misses': 0, 'size': 0, 'maxsize': 0}
+            return {'encode': dict(empty), 'decode': dict(empty)}
+        result = {}
+        for name, fn in (('encode', self.encode), ('decode', self._decode)):
+            info = fn.cache_info()
+            result[name] = {'hits': info.hits, 'misses': info.misses,
+                            'size': info.currsize, 'maxsize': info.maxsize}
+        return result
+
+
+# Shared cache used by Packet and the decoders; resize with IMEI_CACHE.resize(n)
+IMEI_CACHE = BcdCache()
+
+__all__ = ['encode_imei_bcd', 'decode_imei_bcd', 'BcdCache', 'IMEI_CACHE', 'EMPTY_IMEI_BCD']
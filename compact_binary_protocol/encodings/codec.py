@@ -0,0 +1,117 @@
+"""
+Precompiled struct codecs shared by the Data* classes, packets and decoders.
+
+Every Struct is compiled once at import time. The write_* helpers serialize straight
+into a caller-supplied bytearray (or writable memoryview) at an offset and return the
+offset just past the written bytes. The buffer must already be large enough.
+"""
+import struct
+
+# Packet header up to the IMEI length byte: [version u8][cmd 2x u8][txn_id u16][imei_len u8]
+PACKET_HEADER = struct.Struct('>BBBHB')
+
+# Data item header: [type u8][version u8][length u16]
+ITEM_HEADER = struct.Struct('>BBH')
+
+U8 = struct.Struct('>B')
+I8 = struct.Struct('>b')
+U16 = struct.Struct('>H')
+U32 = struct.Struct('>I')
+I32 = struct.Struct('>i')
+
+# Fixed-size payloads
+STEPS = struct.Struct('>i')
+DEVICE_STATUS = struct.Struct('>BB')
+ENVIRONMENT = struct.Struct('>HHHB')
+GNSS = struct.Struct('>Bff')
+MULTI_HEAD = struct.Struct('>IHB')
+MULTI_RECORD = struct.Struct('>hh')
+
+# Item header fused with a fixed-size payload, so a whole item is one pack/pack_into call
+STEPS_ITEM = struct.Struct('>BBHi')
+DEVICE_STATUS_ITEM = struct.Struct('>BBHBB')
+ENVIRONMENT_ITEM = struct.Struct('>BBHHHHB')
+GNSS_ITEM = struct.Struct('>BBHBff')
+MULTI_ITEM_HEAD = struct.Struct('>BBHIHB')
+
+# Whole packet header, one Struct per packed IMEI length (0..255), compiled on first use:
+# [version u8][cmd 2s][txn_id u16][imei_len u8][imei Ns][timestamp u32]
+# Hot paths index HEADER_STRUCTS and fall back to header_struct(n) for a None slot.
+HEADER_STRUCTS = [None] * 256
+
+
+def header_struct(imei_len: int) -> struct.Struct:
+    """Return the Struct packing a whole packet header with a ``imei_len``-byte IMEI."""
+    s = HEADER_STRUCTS[imei_len]
+    if s is None:
+        s = HEADER_STRUCTS[imei_len] = struct.Struct(f'>B2sHB{imei_len}sI')
+    return s
+
+
+# Records of a DataMulti item, one Struct per record count (0..255), compiled on first use
+_MULTI_RECORDS = [None] * 256
+
+
+def multi_records_struct(count: int) -> struct.Struct:
+    """Return the Struct packing ``count`` (temperature, humidity) int16 pairs."""
+    s = _MULTI_RECORDS[count]
+    if s is None:
+        s = _MULTI_RECORDS[count] = struct.Struct(f'>{2 * count}h')
+    return s
+
+
+class VarItemStructs(dict):
+    """
+    Structs for an item whose payload is ``prefix``, then one VarString per entry of the key,
+    then ``suffix``. Keyed by the tuple of string lengths (each <= 255) and compiled on first
+    use, so a whole item with variable-length strings is still one pack/pack_into call.
+    """
+    MAX_ENTRIES = 4096
+
+    def __init__(self, prefix: str = '', suffix: str = ''):
+        super().__init__()
+        self.prefix = prefix
+        self.suffix = suffix
+
+    def __missing__(self, lengths):
+        s = struct.Struct('>BBH' + self.prefix + ''.join(f'B{n}s' for n in lengths) + self.suffix)
+        if len(self) < self.MAX_ENTRIES:
+            self[lengths] = s
+        return s
+
+
+def var_string_size(value: str) -> int:
+    """Encoded size of a VarString (ASCII, truncated to 255 bytes)."""
+    return 1 + min(len(value), 255)
+
+
+def write_item_header(buf, offset: int, sensor_type: int, sensor_version: int, length: int) -> int:
+    ITEM_HEADER.pack_into(buf, offset, sensor_type, sensor_version, length)
+    return offset + ITEM_HEADER.size
+
+
+def write_var_bytes(buf, offset: int, data) -> int:
+    """Write VarBytes (len u8 + raw bytes), truncating to 255 bytes."""
+    length = len(data)
+    if length > 255:
+        data = data[:255]
+        length = 255
+    end = offset + 1 + length
+    if end > len(buf):
+        raise ValueError(f"Buffer too small to write {length} bytes at offset {offset}")
+    buf[offset] = length
+    buf[offset + 1:end] = data
+    return end
+
+
+def write_var_string(buf, offset: int, value: str) -> int:
+    """Write a VarString (len u8 + ASCII bytes), truncating to 255 bytes."""
+    return write_var_bytes(buf, offset, value.encode('ascii'))
+
+
+__all__ = [
+    'PACKET_HEADER', 'ITEM_HEADER', 'U8', 'I8', 'U16', 'U32', 'I32',
+    'STEPS', 'DEVICE_STATUS', 'ENVIRONMENT', 'GNSS', 'MULTI_HEAD', 'MULTI_RECORD',
+    'STEPS_ITEM', 'DEVICE_STATUS_ITEM', 'ENVIRONMENT_ITEM', 'GNSS_ITEM', 'MULTI_ITEM_HEAD',
+    'HEADER_STRUCTS', 'header_struct', 'multi_records_struct', 'VarItemStructs', 'var_string_size', 'write_item_header', 'write_var_bytes', 'write_var_string',
+]
@@ -0,0 +1,227 @@
+"""
+Key/value payload codec ([count u8][key VarString][value VarString]...) shared by DataKv,
+ConfigPacket and DataReader.
+
+Config keys repeat across the whole fleet, so decoded keys go through a bounded symbol
+table (one interned str per distinct key) and whole payloads go through a bounded LRU
+cache: byte-identical payloads, the common case after a restart storm, decode to the same
+immutable tuple of pairs. KvView decodes values lazily from a memoryview for callers that
+only need a few keys. encode_kv_pairs() builds a payload with a single join.
+"""
+import sys
+from collections.abc import Mapping
+from functools import lru_cache
+
+# Symbol table: raw key bytes -> interned str, and str -> encoded VarString for the writer
+MAX_KEYS = 4096
+_KEY_STR = {}
+_KEY_VAR = {}
+_LENGTHS = tuple(bytes((n,)) for n in range(256))
+
+
+def intern_key(raw: bytes) -> str:
+    """Decode an ASCII key, returning the shared str for keys seen before."""
+    key = _KEY_STR.get(raw)
+    if key is None:
+        key = str(raw, 'ascii')
+        if len(_KEY_STR) < MAX_KEYS:
+            key = sys.intern(key)
+            _KEY_STR[raw] = key
+    return key
+
+
+def _key_var(key: str) -> bytes:
+    var = _KEY_VAR.get(key)
+    if var is None:
+        raw = key.encode('ascii')[:255]
+        var = _LENGTHS[len(raw)] + raw
+        if len(_KEY_VAR) < MAX_KEYS:
+            _KEY_VAR[key] = var
+    return var
+
+
+def _scan(data: bytes, strict: bool):
+    """Decode pairs from a KV payload; a truncated payload raises ValueError or, unless
+    ``strict``, yields the pairs decoded so far."""
+    end = len(data)
+    if end == 0:
+        return ()
+    count = data[0]
+    offset = 1
+    pairs = []
+    key_str = _KEY_STR
+    for _ in range(count):
+        if offset >= end:
+            break
+        n = data[offset]
+        start = offset + 1
+        offset = start + n
+        if offset >= end:  # the value length byte must follow
+            break
+        raw = data[start:offset]
+        key = key_str.get(raw) or intern_key(raw)
+        n = data[offset]
+        start = offset + 1
+        offset = start + n
+        if offset > end:
+            break
+        pairs.append((key, str(data[start:offset], 'ascii')))
+    else:
+        return tuple(pairs)
+    if strict:
+        raise ValueError(f"Truncated KV payload: {len(pairs)} of {count} pairs")
+    return tuple(pairs)
+
+
+def decode_kv_pairs(payload, strict: bool = True) -> tuple:
+    """Decode a KV payload (bytes-like) into a tuple of (key, value) str pairs, uncached."""
+    return _scan(bytes(payload), strict)
+
+
+class KvCache:
+    """
+    Bounded LRU cache of KV payload bytes -> tuple of pairs. The tuples are shared between
+    callers and must be treated as read-only (dict(pairs) or list(pairs) to modify).
+    ``maxsize=0`` disables caching.
+    """
+    def __init__(self, maxsize: int | None = 4096):
+        self.resize(maxsize)
+
+    def resize(self, maxsize: int | None):
+        """Change the bound; this drops all cached payloads and resets the stats."""
+        self.maxsize = maxsize
+        if maxsize == 0:
+            self._strict = lambda data: _scan(data, True)
+        else:
+            self._strict = lru_cache(maxsize=maxsize)(lambda data: _scan(data, True))
+
+    def decode_pairs(self, payload, strict: bool = True) -> tuple:
+        """
+        Pairs of a KV payload. Truncated payloads raise ValueError, or with ``strict=False``
+        return the pairs before the truncation (those results are not cached).
+        """
+        # Cache keys must be immutable and must not pin the caller's datagram buffer
+        data = payload if type(payload) is bytes else bytes(payload)
+        try:
+            return self._strict(data)
+        except (ValueError, UnicodeDecodeError):
+            if strict:
+                raise
+            return _scan(data, False)
+
+    def decode_dict(self, payload) -> dict:
+        """A new dict of a KV payload (later duplicate keys win)."""
+        return dict(self.decode_pairs(payload))
+
+    def clear(self):
+        if self.maxsize != 0:
+            self._strict.cache_clear()
+
+    def stats(self) -> dict:
+        if self.maxsize == 0:
+            return {'hits': 0, 'misses': 0, 'size': 0, 'maxsize': 0}
+        info = self._strict.cache_info()
+        return {'hits': info.hits, 'misses': info.misses, 'size': info.currsize, 'maxsize': info.maxsize}
+
+
+# Shared cache used by DataKv, ConfigPacket and DataReader; resize with KV_CACHE.resize(n)
+KV_CACHE = KvCache()
+
+
+class KvView(Mapping):
+    """
+    Read-only mapping over a KV payload in bytes, bytearray or memoryview. Keys are indexed
+    (and interned) on construction; each value is decoded from the buffer on first access.
+    The view keeps a reference to the buffer, so do not reuse it while the view is alive.
+    """
+    __slots__ = ('_buf', '_spans', '_values')
+
+    def __init__(self, payload):
+        buf = memoryview(payload)
+        end = len(buf)
+        spans = {}
+        count = buf[0] if end else 0
+        offset = 1
+        for _ in range(count):
+            if offset >= end:
+                raise ValueError("Truncated KV payload")
+            n = buf[offset]
+            start = offset + 1
+            offset = start + n
+            if offset >= end:
+                raise ValueError("Truncated KV payload")
+            key = intern_key(bytes(buf[start:offset]))
+            n = buf[offset]
+            start = offset + 1
+            offset = start + n
+            if offset > end:
+                raise ValueError("Truncated KV payload")
+            spans[key] = (start, offset)
+        self._buf = buf
+        self._spans = spans
+        self._values = {}
+
+    def __getitem__(self, key):
+        value = self._values.get(key)
+        if value is None:
+            start, end = self._spans[key]
+            value = self._values[key] = str(self._buf[start:end], 'ascii')
+        return value
+
+    def __contains__(self, key):
+        return key in self._spans
+
+    def __iter__(self):
+        return iter(self._spans)
+
+    def __len__(self):
+        return len(self._spans)
+
+
+def normalize_kv_pairs(kv_pairs) -> list:
+    """A dict or iterable of (key, value) as a list of (str, str); None keys are dropped
+    and None values become ''."""
+    if kv_pairs is None:
+        return []
+    items = kv_pairs.items() if isinstance(kv_pairs, dict) else kv_pairs
+    return [(str(k), '' if v is None else str(v)) for k, v in items if k is not None]
+
+
+def kv_payload_size(pairs) -> int:
+    """Encoded size of a KV payload (strings truncated to 255 bytes)."""
+    size = 1
+    for key, value in pairs:
+        size += 2 + min(len(key), 255) + min(len(value), 255)
+    return size
+
+
+def encode_kv_pairs(pairs) -> bytes:
+    """Encode a KV payload (at most 255 pairs) in one pass, joining the parts once."""
+    if len(pairs) > 255:
+        raise ValueError(f"Too many KV pairs: {len(pairs)} > 255")
+    parts = [_LENGTHS[len(pairs)]]
+    append = parts.append
+    key_var = _KEY_VAR
+    for key, value in pairs:
+        append(key_var.get(key) or _key_var(key))
+        raw = value.encode('ascii')
+        n = len(raw)
+        if n > 255:
+            raw = raw[:255]
+            n = 255
+        append(_LENGTHS[n])
+        append(raw)
+    return b''.join(parts)
+
+
+def write_kv_pairs(buf, offset: int, pairs) -> int:
+    """Write a KV payload (at most 255 pairs) into ``buf`` at ``offset`` and return the end offset."""
+    payload = encode_kv_pairs(pairs)
+    end = offset + len(payload)
+    if end > len(buf):
+        raise ValueError(f"Buffer too small to write {len(payload)} bytes at offset {offset}")
+    buf[offset:end] = payload
+    return end
+
+
+__all__ = ['KvCache', 'KV_CACHE', 'KvView', 'intern_key', 'decode_kv_pairs', 'normalize_kv_pairs', 'kv_payload_size', 'encode_kv_pairs', 'write_kv_pairs']
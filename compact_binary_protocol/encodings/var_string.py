@@ -1,4 +1,4 @@
-import struct
+from .codec import U8
 
 def encode_var_string(input_str: str) -> bytes:
     """
@@ -8,4 +8,18 @@ def encode_var_string(input_str: str) -> bytes:
     bytes_data = input_str.encode('ascii')
     if len(bytes_data) > 255:
         bytes_data = bytes_data[:255]
-    return struct.pack('>B', len(bytes_data)) + bytes_data
+    return U8.pack(len(bytes_data)) + bytes_data
+
+
+def decode_var_string(buf, offset: int = 0):
+    """
+    Decode a VarString starting at ``offset`` in ``buf`` (bytes, bytearray or memoryview).
+    Returns (str, next_offset). The string is decoded straight from the buffer without
+    an intermediate bytes copy.
+    """
+    length = buf[offset]
+    start = offset + 1
+    end = start + length
+    if end > len(buf):
+        raise ValueError(f"Not enough data to read string of length {length}")
+    return str(buf[start:end], 'ascii'), end
@@ -0,0 +1,264 @@
+"""
+Optional metrics for the encode/decode hot paths.
+
+Nothing is measured until enable() is called. enable() swaps instrumented versions into
+the places the hot paths dispatch through (the decoder registry table, decode_packet's
+implementation, Packet.write_into and each registered Data class's write_into), and
+disable() puts the originals back, so a disabled build runs the plain functions with no
+per-call checks.
+
+Recorded metrics, keyed by (type, version) for items and by command for packets:
+  - item.decoded / item.decode_ns / item.payload_bytes / item.malformed
+  - item.unknown (items decoded as DataRaw)
+  - item.encoded / item.encode_ns / item.encoded_bytes          (Data*.write_into)
+  - packet.decoded / packet.decode_ns / packet.bytes / packet.malformed (key None)
+  - packet.encoded / packet.encode_ns / packet.encoded_bytes    (Packet.write_into/to_bytes)
+
+Names ending in _ns or _bytes are histograms (sink.observe), the others counters (sink.count).
+Any object with ``count(name, key, n=1)`` and ``observe(name, key, value)`` can be the sink;
+MemorySink aggregates in-process into Histogram objects.
+"""
+import time
+
+from .data import DataRaw
+from .decoders import packet_decoder
+from .decoders.registry import DATA_REGISTRY
+from .packets import Packet
+
+
+class Histogram:
+    """
+    Log-linear histogram of non-negative integers (HDR style).
+
+    Values below 2 * 2**sub_bits are counted exactly; above that every power of two is
+    split into 2**sub_bits buckets, so any recorded value is reported within a relative
+    error of 2**-sub_bits (sub_bits=7: under 0.8%).
+    """
+    __slots__ = ('sub_bits', 'counts', 'count', 'total', 'min', 'max')
+
+    def __init__(self, sub_bits: int = 7):
+        self.sub_bits = sub_bits
+        self.counts = []
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+
+    def _index(self, value):
+        shift = value.bit_length() - self.sub_bits - 1
+        return (shift << self.sub_bits) + (value >> shift) if shift > 0 else value
+
+    def _bounds(self, index):
+        """(lowest, highest) value counted in bucket ``index``."""
+        shift = (index >> self.sub_bits) - 1
+        if shift <= 0:
+            return index, index
+        top = index - (shift << self.sub_bits)
+        return top << shift, ((top + 1) << shift) - 1
+
+    def record(self, value, n: int = 1):
+        value = int(value)
+        if value < 0:
+            value = 0
+        index = self._index(value)
+        counts = self.counts
+        if index >= len(counts):
+            counts.extend([0] * (index + 1 - len(counts)))
+        counts[index] += n
+        self.count += n
+        self.total += value * n
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def merge(self, other: 'Histogram'):
+        """Add the counts of another histogram with the same sub_bits (e.g. from another process)."""
+        if other.sub_bits != self.sub_bits:
+            raise ValueError("Cannot merge histograms with different sub_bits")
+        if len(other.counts) > len(self.counts):
+            self.counts.extend([0] * (len(other.counts) - len(self.counts)))
+        for index, n in enumerate(other.counts):
+            self.counts[index] += n
+        self.count += other.count
+        self.total += other.total
+        for value in (other.min, other.max):
+            if value is not None:
+                self.min = value if self.min is None else min(self.min, value)
+                self.max = value if self.max is None else max(self.max, value)
+
+    def percentile(self, p: float):
+        """Value at percentile ``p`` (0..100): the highest value of the bucket reaching it."""
+        if not self.count:
+            return None
+        rank = max(1, -(-self.count * p // 100))
+        seen = 0
+        for index, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                return min(self._bounds(index)[1], self.max)
+        return self.max
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else None
+
+    def summary(self):
+        return {
+            'count': self.count, 'min': self.min, 'max': self.max, 'mean': self.mean,
+            'p50': self.percentile(50), 'p90': self.percentile(90),
+            'p99': self.percentile(99), 'p999': self.percentile(99.9),
+        }
+
+
+class MemorySink:
+    """Aggregates counters and histograms in-process; read them with snapshot()."""
+
+    def __init__(self, sub_bits: int = 7):
+        self.sub_bits = sub_bits
+        self.counters = {}
+        self.histograms = {}
+
+    def count(self, name, key, n=1):
+        counters = self.counters
+        counters[name, key] = counters.get((name, key), 0) + n
+
+    def observe(self, name, key, value):
+        histogram = self.histograms.get((name, key))
+        if histogram is None:
+            histogram = self.histograms[name, key] = Histogram(self.sub_bits)
+        histogram.record(value)
+
+    def snapshot(self):
+        """{'counters': {name: {key: n}}, 'histograms': {name: {key: summary}}}"""
+        counters, histograms = {}, {}
+        for (name, key), n in self.counters.items():
+            counters.setdefault(name, {})[key] = n
+        for (name, key), histogram in self.histograms.items():
+            histograms.setdefault(name, {})[key] = histogram.summary()
+        return {'counters': counters, 'histograms': histograms}
+
+    def reset(self):
+        self.counters.clear()
+        self.histograms.clear()
+
+
+# ---- Instrumented replacements ----
+def _item_decoder(sink, key, decode):
+    count, observe, clock = sink.count, sink.observe, time.perf_counter_ns
+
+    def instrumented(payload):
+        start = clock()
+        try:
+            item = decode(payload)
+        except Exception:
+            count('item.malformed', key)
+            raise
+        observe('item.decode_ns', key, clock() - start)
+        observe('item.payload_bytes', key, len(payload))
+        count('item.decoded', key)
+        return item
+    return instrumented
+
+
+def _unknown_item(sink):
+    count = sink.count
+
+    def instrumented(sensor_type, sensor_version, payload):
+        count('item.unknown', (sensor_type, sensor_version))
+        return DataRaw(sensor_type, sensor_version, payload)
+    return instrumented
+
+
+def _packet_decoder(sink, decode):
+    count, observe, clock = sink.count, sink.observe, time.perf_counter_ns
+
+    def instrumented(buf):
+        start = clock()
+        try:
+            packet = decode(buf)
+        except ValueError:
+            count('packet.malformed', None)
+            raise
+        command = packet.command
+        observe('packet.decode_ns', command, clock() - start)
+        observe('packet.bytes', command, len(buf))
+        count('packet.decoded', command)
+        return packet
+    return instrumented
+
+
+def _item_encoder(sink, write_into):
+    count, observe, clock = sink.count, sink.observe, time.perf_counter_ns
+
+    def instrumented(self, buf, offset=0):
+        start = clock()
+        end = write_into(self, buf, offset)
+        key = (self.sensor_type, self.sensor_version)
+        observe('item.encode_ns', key, clock() - start)
+        observe('item.encoded_bytes', key, end - offset)
+        count('item.encoded', key)
+        return end
+    return instrumented
+
+
+def _packet_encoder(sink, write_into):
+    count, observe, clock = sink.count, sink.observe, time.perf_counter_ns
+
+    def instrumented(self, buf, offset=0, template=None):
+        start = clock()
+        end = write_into(self, buf, offset, template)
+        command = self.command
+        observe('packet.encode_ns', command, clock() - start)
+        observe('packet.encoded_bytes', command, end - offset)
+        count('packet.encoded', command)
+        return end
+    return instrumented
+
+
+_sink = None
+_patched = []  # (owner, attribute, original)
+
+
+def _patch(owner, name, replacement):
+    _patched.append((owner, name, getattr(owner, name)))
+    setattr(owner, name, replacement)
+
+
+def enable(sink=None):
+    """
+    Start recording into ``sink`` (default: a new MemorySink) and return it. Data types
+    registered after this call are decoded with metrics but their encoders are not
+    instrumented; call enable() again to pick them up.
+    """
+    global _sink
+    disable()
+    sink = MemorySink() if sink is None else sink
+    DATA_REGISTRY.instrument(lambda key, decode: _item_decoder(sink, key, decode), _unknown_item(sink))
+    _patch(packet_decoder, '_decode', _packet_decoder(sink, packet_decoder._decode))
+    _patch(Packet, 'write_into', _packet_encoder(sink, Packet.write_into))
+    classes = {codec for _, codec in DATA_REGISTRY.items() if isinstance(codec, type)}
+    classes.add(DataRaw)
+    for cls in classes:
+        if 'write_into' in vars(cls):
+            _patch(cls, 'write_into', _item_encoder(sink, cls.write_into))
+    _sink = sink
+    return sink
+
+
+def disable():
+    """Stop recording and restore the uninstrumented functions."""
+    global _sink
+    DATA_REGISTRY.instrument()
+    while _patched:
+        owner, name, original = _patched.pop()
+        setattr(owner, name, original)
+    _sink = None
+
+
+def sink():
+    """The active sink, or None when metrics are disabled."""
+    return _sink
+
+
+__all__ = ['Histogram', 'MemorySink', 'enable', 'disable', 'sink']
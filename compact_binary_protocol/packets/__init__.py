@@ -1,9 +1,20 @@
+from .template import HeaderTemplate, HeaderTemplateCache, HEADER_TEMPLATES
 from .base import Packet
 from .telemetry import TelemetryPacket
 from .config import ConfigPacket
+from .raw import RawPacket
+from .ack import AckPacket
+from .bulk import BulkPackets, encode_config_bulk
 
 __all__ = [
     'Packet',
     'TelemetryPacket',
     'ConfigPacket',
+    'RawPacket',
+    'AckPacket',
+    'HeaderTemplate',
+    'HeaderTemplateCache',
+    'HEADER_TEMPLATES',
+    'BulkPackets',
+    'encode_config_bulk',
 ]
@@ -0,0 +1,25 @@
+from .base import Packet
+
+class AckPacket(Packet):
+    """
+    Acknowledge packet (command "A"), sent server → device.
+    Header only: the transaction ID and IMEI must match the packet being acknowledged.
+    """
+    __slots__ = ()
+
+    def __init__(self, imei, transaction_id=0, timestamp: int | None = None, version=1):
+        super().__init__('A', imei, transaction_id, version, timestamp=timestamp)
+
+    @classmethod
+    def for_packet(cls, packet, timestamp: int | None = None):
+        """Build the Ack for a received packet (same IMEI, transaction ID and version)."""
+        return cls(packet.device_id, packet.transaction_id, timestamp, packet.version)
+
+    def body_size(self):
+        return 0
+
+    def write_body_into(self, buf, offset):
+        return offset
+
+    def to_bytes(self):
+        return self.build_header()
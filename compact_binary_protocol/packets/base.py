@@ -1,7 +1,10 @@
-import struct
 import time
+from ..encodings.bcd import IMEI_CACHE
+from .template import HEADER_TEMPLATES
 
 class Packet:
+    __slots__ = ('command', 'device_id', 'transaction_id', 'version', 'timestamp')
+
     def __init__(self, command, device_id, transaction_id=0, version=1, timestamp: int | None = None):
         # Ensure command is exactly 2 characters (pad or truncate)
         if len(command) == 1:
@@ -18,33 +21,59 @@ class Packet:
 
     @staticmethod
     def _encode_imei_bcd(device_id_str: str) -> bytes:
-        digits = ''.join(ch for ch in device_id_str if ch.isdigit())
-        if len(digits) == 0:
-            return b"\x00" * 8
-        if len(digits) % 2 == 1:
-            digits = '0' + digits
-        b = bytearray()
-        for i in range(0, len(digits), 2):
-            low = int(digits[i+1])
-            high = int(digits[i])
-            b.append((high << 4) | low)
-        return bytes(b)
+        # Packed BCD via the shared LRU cache (see encodings.bcd)
+        return IMEI_CACHE.encode(device_id_str)
+
+    @staticmethod
+    def _decode_imei_bcd(bcd) -> str:
+        # Inverse of _encode_imei_bcd; drops the leading 0 nibble used to pad odd-length IMEIs.
+        return IMEI_CACHE.decode(bcd)
+
+    def header_template(self):
+        """Cached HeaderTemplate for this packet's device, command and version."""
+        return HEADER_TEMPLATES.get(self.device_id, self.command, self.version)
+
+    def header_size(self) -> int:
+        return HEADER_TEMPLATES.get(self.device_id, self.command, self.version).size
+
+    def write_header_into(self, buf, offset=0, template=None) -> int:
+        """Write the common header into ``buf`` at ``offset`` and return the end offset.
+        ``template`` is this packet's header_template() if the caller already has it."""
+        if template is None:
+            template = HEADER_TEMPLATES.get(self.device_id, self.command, self.version)
+        return template.write_into(buf, offset, self.transaction_id, self.timestamp)
 
     def build_header(self):
-        device_id_bytes = Packet._encode_imei_bcd(self.device_id)
-        header = struct.pack('>BBBHB',
-                             self.version,
-                             ord(self.command[0]),
-                             ord(self.command[1]),
-                             self.transaction_id,
-                             len(device_id_bytes)) + device_id_bytes
-        # Append base timestamp (u32)
-        header += struct.pack('>I', self.timestamp)
-        return header
+        return HEADER_TEMPLATES.get(self.device_id, self.command, self.version).build(
+            self.transaction_id, self.timestamp)
 
-    def to_bytes(self):
+    # ---- Body encoding, implemented by subclasses ----
+    def body_size(self) -> int:
         raise NotImplementedError()
 
+    def write_body_into(self, buf, offset) -> int:
+        raise NotImplementedError()
+
+    def size_hint(self) -> int:
+        """Exact number of bytes produced by to_bytes()/write_into()."""
+        return self.header_size() + self.body_size()
+
+    def write_into(self, buf, offset=0, template=None) -> int:
+        """
+        Serialize the packet into ``buf`` (bytearray or writable memoryview) at ``offset``
+        and return the end offset. ``buf`` must have at least size_hint() bytes available,
+        which allows encoding many packets into one reused buffer without allocations.
+        ``template`` is passed on to write_header_into().
+        """
+        return self.write_body_into(buf, self.write_header_into(buf, offset, template))
+
+    def to_bytes(self):
+        # One HEADER_TEMPLATES lookup per encode, shared by sizing and writing
+        template = HEADER_TEMPLATES.get(self.device_id, self.command, self.version)
+        buf = bytearray(template.size + self.body_size())
+        self.write_into(buf, 0, template)
+        return bytes(buf)
+
     def print(self, packet_type):
         packet_bytes = self.to_bytes()
         print("v" * 50)
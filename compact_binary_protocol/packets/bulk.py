@@ -0,0 +1,109 @@
+"""
+Bulk encoding of one configuration body for a cohort of devices.
+
+Pushing a config change produces the same KV body for every device; only the header
+(IMEI, transaction ID) differs. encode_config_bulk() encodes the body once and stamps each
+device's header in front of a copy of it with one Struct.pack_into, writing all packets
+back to back into a single bytearray. Large cohorts can be split into chunks and encoded
+on a concurrent.futures executor (e.g. a ProcessPoolExecutor, one chunk per task); the
+chunks are joined into the same contiguous buffer.
+"""
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+from ..encodings.bcd import encode_imei_bcd
+from ..encodings.codec import header_struct
+from ..encodings.kv import encode_kv_pairs, normalize_kv_pairs
+
+
+class BulkPackets:
+    """
+    Packets encoded back to back in ``buffer``; packet ``i`` is
+    ``buffer[offsets[i]:offsets[i + 1]]``. Indexing and iteration yield memoryviews into the
+    buffer, so sending them does not copy.
+    """
+    __slots__ = ('buffer', 'offsets')
+
+    def __init__(self, buffer: bytearray, offsets: array):
+        self.buffer = buffer
+        self.offsets = offsets
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index: int) -> memoryview:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("packet index out of range")
+        return memoryview(self.buffer)[self.offsets[index]:self.offsets[index + 1]]
+
+    def __iter__(self):
+        view = memoryview(self.buffer)
+        offsets = self.offsets
+        for i in range(len(offsets) - 1):
+            yield view[offsets[i]:offsets[i + 1]]
+
+
+def _encode_chunk(body: bytes, command: bytes, version: int, timestamp: int, devices):
+    """Encode ``devices`` [(imei, transaction_id)] into (bytearray, array('Q') of offsets)."""
+    imeis = [encode_imei_bcd(imei) for imei, _ in devices]
+    size = len(body)
+    total = len(imeis) * (header_struct(0).size + size) + sum(map(len, imeis))
+    buf = bytearray(total)
+    offsets = array('Q', [0])
+    append = offsets.append
+    offset = 0
+    for (_, transaction_id), imei in zip(devices, imeis):
+        s = header_struct(len(imei))
+        s.pack_into(buf, offset, version, command, transaction_id, len(imei), imei, timestamp)
+        offset += s.size
+        end = offset + size
+        buf[offset:end] = body
+        offset = end
+        append(offset)
+    return buf, offsets
+
+
+def encode_config_bulk(kv_pairs, devices, command: str = 'W', version: int = 1, timestamp: int | None = None,
+                       *, workers: int | None = None, executor=None, chunk_size: int = 65536) -> BulkPackets:
+    """
+    Encode a ConfigPacket with body ``kv_pairs`` (dict or (key, value) pairs) for every
+    (imei, transaction_id) in ``devices``, all stamped with ``timestamp`` (default: now).
+
+    By default everything is encoded in this process. With ``workers`` > 1 a
+    ProcessPoolExecutor of that size is used, or pass any ``executor`` to reuse one;
+    devices are then submitted in chunks of ``chunk_size``. Packets come back in the order
+    of ``devices`` and are byte-identical to ConfigPacket(imei, kv_pairs, txn, command).to_bytes().
+    """
+    pairs = normalize_kv_pairs(kv_pairs)
+    body = encode_kv_pairs(pairs)
+    cmd = (command + '\0\0')[:2].encode('latin-1')
+    if timestamp is None:
+        timestamp = int(time.time())
+    devices = list(devices)
+
+    if not devices or (executor is None and (workers is None or workers <= 1)):
+        return BulkPackets(*_encode_chunk(body, cmd, version, timestamp, devices))
+
+    chunks = [devices[i:i + chunk_size] for i in range(0, len(devices), chunk_size)]
+    n = len(chunks)
+    pool = executor or ProcessPoolExecutor(max_workers=workers)
+    try:
+        results = list(pool.map(_encode_chunk, [body] * n, [cmd] * n, [version] * n, [timestamp] * n, chunks))
+    finally:
+        if executor is None:
+            pool.shutdown()
+
+    buffer = bytearray(sum(len(buf) for buf, _ in results))
+    offsets = array('Q', [0])
+    base = 0
+    for buf, chunk_offsets in results:
+        buffer[base:base + len(buf)] = buf
+        offsets.extend([base + o for o in chunk_offsets[1:]])
+        base += len(buf)
+    return BulkPackets(buffer, offsets)
+
+
+__all__ = ['BulkPackets', 'encode_config_bulk']
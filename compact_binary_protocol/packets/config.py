@@ -1,6 +1,6 @@
-import struct
 from .base import Packet
-from ..encodings import encode_var_string
+from ..encodings.kv import encode_kv_pairs, kv_payload_size, normalize_kv_pairs, write_kv_pairs
+from .template import HEADER_TEMPLATES
 
 class ConfigPacket(Packet):
     """
@@ -12,53 +12,42 @@ class ConfigPacket(Packet):
           - value: VarString (ASCII)
     All keys and values are strings.
     """
-    def __init__(self, imei, kv_pairs, transaction_id=0):
-        super().__init__('C', imei, transaction_id)
-        # Normalize to list of (key, value) tuples with str types
-        if isinstance(kv_pairs, dict):
-            items = list(kv_pairs.items())
-        else:
-            items = list(kv_pairs or [])
-        norm = []
-        for k, v in items:
-            if k is None:
-                continue
-            ks = str(k)
-            vs = '' if v is None else str(v)
-            norm.append((ks, vs))
-        self.pairs = norm
+    __slots__ = ('pairs',)
+
+    def __init__(self, imei, kv_pairs, transaction_id=0, command='C'):
+        super().__init__(command, imei, transaction_id)
+        self.pairs = normalize_kv_pairs(kv_pairs)
+
+    def body_size(self):
+        return kv_payload_size(self.pairs)
+
+    def write_body_into(self, buf, offset):
+        return write_kv_pairs(buf, offset, self.pairs)
 
     def to_bytes(self):
-        header = self.build_header()
-        count = len(self.pairs)
-        body = struct.pack('>B', count)
-        for k, v in self.pairs:
-            body += encode_var_string(k)
-            body += encode_var_string(v)
-        return header + body
+        # Encode the body once instead of sizing it and writing it in two passes
+        body = encode_kv_pairs(self.pairs)
+        template = HEADER_TEMPLATES.get(self.device_id, self.command, self.version)
+        buf = bytearray(template.size + len(body))
+        buf[self.write_header_into(buf, 0, template):] = body
+        return bytes(buf)
 
     @staticmethod
     def decode(imei: str, transaction_id: int, data: bytes):
-        from ..decoders import DataReader
-        reader = DataReader(data)
-        if len(data) == 0:
-            count = 0
-        else:
-            reader.read_u8()
-            reader.read_data_item_header()
-            count = reader.read_u8()
+        """Decode a reply body [count u8][data items...]; pairs are taken from its DataKv items."""
+        from ..data import DataKv
+        from ..decoders import DataReader, DATA_REGISTRY
         pairs = []
-        for _ in range(count):
-            key = reader.read_var_string()
-            value = reader.read_var_string()
-            pairs.append((key, value))
-        return ConfigPacket(imei, pairs, transaction_id)
+        for dtype, dver, payload in DataReader(data).read_data_items():
+            item = DATA_REGISTRY.decode(dtype, dver, payload)
+            if isinstance(item, DataKv):
+                pairs.extend(item.pairs)
+        packet = ConfigPacket(imei, (), transaction_id)
+        packet.pairs = pairs
+        return packet
 
     def to_dict(self):
-        d = {}
-        for k, v in self.pairs:
-            d[k] = v
-        return d
+        return dict(self.pairs)
 
     def print(self, packet_type):
         packet_bytes = self.to_bytes()
@@ -0,0 +1,22 @@
+from .base import Packet
+
+class RawPacket(Packet):
+    """
+    Packet whose body is kept as raw bytes.
+    Used by the decoder for commands that have no dedicated packet class.
+    """
+    __slots__ = ('body',)
+
+    def __init__(self, command, imei, transaction_id=0, body=b'', version=1, timestamp: int | None = None):
+        super().__init__(command, imei, transaction_id, version, timestamp=timestamp)
+        self.body = bytes(body)
+
+    def body_size(self):
+        return len(self.body)
+
+    def write_body_into(self, buf, offset):
+        end = offset + len(self.body)
+        if end > len(buf):
+            raise ValueError(f"Buffer too small to write body at offset {offset}")
+        buf[offset:end] = self.body
+        return end
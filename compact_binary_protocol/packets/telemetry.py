@@ -1,4 +1,3 @@
-import struct
 from .base import Packet
 
 class TelemetryPacket(Packet):
@@ -10,6 +9,8 @@ class TelemetryPacket(Packet):
       - data items...
     Note: Timestamp has moved to the base packet header (u32)
     """
+    __slots__ = ('data',)
+
     def __init__(self, imei, timestamp, transaction_id, event, data=None):
         """
         Compat constructor:
@@ -26,12 +27,18 @@ class TelemetryPacket(Packet):
         else:
             self.data = [data]
 
-    def to_bytes(self):
-        header = self.build_header()
-        data_count_val = len(self.data)
-        body = struct.pack('>B', data_count_val)
-        body += b''.join(sd.to_bytes() for sd in self.data)
-        return header + body
+    def body_size(self):
+        size = 1
+        for sd in self.data:
+            size += sd.size_hint()
+        return size
+
+    def write_body_into(self, buf, offset):
+        buf[offset] = len(self.data)
+        offset += 1
+        for sd in self.data:
+            offset = sd.write_into(buf, offset)
+        return offset
 
     def print(self, packet_type):
         packet_bytes = self.to_bytes()
@@ -0,0 +1,99 @@
+"""
+Prebuilt packet headers.
+
+For one device the header bytes only differ in the transaction ID and the timestamp, so
+HeaderTemplate keeps the version, command, IMEI length and packed-BCD IMEI in a bytearray
+and patches txn_id/timestamp in with pack_into. HEADER_TEMPLATES caches templates per IMEI
+with LRU eviction; Packet.write_header_into() goes through it.
+"""
+from collections import OrderedDict
+
+from ..encodings.bcd import IMEI_CACHE
+from ..encodings.codec import PACKET_HEADER, U16, U32
+
+# Offset of txn_id in the header: [version u8][cmd 2x u8][txn_id u16]...
+_TXN_OFFSET = 3
+
+
+class HeaderTemplate:
+    """Header of one (device, command, version) with txn_id and timestamp left at zero."""
+    __slots__ = ('device_id', 'command', 'version', 'header', 'size')
+
+    def __init__(self, device_id: str, command: str, version: int = 1):
+        imei = IMEI_CACHE.encode(device_id)
+        header = bytearray(PACKET_HEADER.size + len(imei) + U32.size)
+        PACKET_HEADER.pack_into(header, 0, version, ord(command[0]), ord(command[1]), 0, len(imei))
+        header[PACKET_HEADER.size:PACKET_HEADER.size + len(imei)] = imei
+        self.device_id = device_id
+        self.command = command
+        self.version = version
+        self.header = header
+        self.size = len(header)
+
+    def write_into(self, buf, offset: int, transaction_id: int, timestamp: int) -> int:
+        """Copy the header into ``buf`` at ``offset``, patch txn_id/timestamp and return the end offset."""
+        end = offset + self.size
+        if end > len(buf):
+            raise ValueError(f"Buffer too small to write header at offset {offset}")
+        buf[offset:end] = self.header
+        U16.pack_into(buf, offset + _TXN_OFFSET, transaction_id)
+        U32.pack_into(buf, end - U32.size, timestamp)
+        return end
+
+    def build(self, transaction_id: int, timestamp: int) -> bytes:
+        header = bytearray(self.header)
+        U16.pack_into(header, _TXN_OFFSET, transaction_id)
+        U32.pack_into(header, self.size - U32.size, timestamp)
+        return bytes(header)
+
+
+class HeaderTemplateCache:
+    """
+    HeaderTemplates keyed by IMEI, then (command, version). At most ``maxsize`` devices are
+    kept; the least recently used device is evicted with all its templates.
+    ``maxsize=0`` disables caching (a template is built per call).
+    """
+    def __init__(self, maxsize: int = 65536):
+        self.resize(maxsize)
+
+    def resize(self, maxsize: int):
+        """Change the bound; this drops all cached templates and resets the stats."""
+        self.maxsize = maxsize
+        self._devices = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, device_id: str, command: str, version: int = 1) -> HeaderTemplate:
+        devices = self._devices
+        templates = devices.get(device_id)
+        if templates is None:
+            if self.maxsize == 0:
+                return HeaderTemplate(device_id, command, version)
+            templates = devices[device_id] = {}
+            if len(devices) > self.maxsize:
+                devices.popitem(last=False)
+        else:
+            devices.move_to_end(device_id)
+        template = templates.get((command, version))
+        if template is None:
+            self.misses += 1
+            template = templates[command, version] = HeaderTemplate(device_id, command, version)
+        else:
+            self.hits += 1
+        return template
+
+    def evict(self, device_id: str):
+        """Drop the templates of one device (e.g. when it is deprovisioned)."""
+        self._devices.pop(device_id, None)
+
+    def clear(self):
+        self._devices.clear()
+
+    def stats(self) -> dict:
+        return {'hits': self.hits, 'misses': self.misses, 'devices': len(self._devices), 'maxsize': self.maxsize}
+
+
+# Shared cache used by Packet; resize with HEADER_TEMPLATES.resize(n)
+HEADER_TEMPLATES = HeaderTemplateCache()
+
+__all__ = ['HeaderTemplate', 'HeaderTemplateCache', 'HEADER_TEMPLATES']
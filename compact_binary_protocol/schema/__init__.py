@@ -0,0 +1,7 @@
+from .fields import Field, u8, i8, u16, i16, u32, i32, f32, Scaled, VarString, VarBytes, Repeated
+from .codegen import DataSchema, define_data_type
+
+__all__ = [
+    'Field', 'u8', 'i8', 'u16', 'i16', 'u32', 'i32', 'f32', 'Scaled', 'VarString', 'VarBytes', 'Repeated',
+    'DataSchema', 'define_data_type',
+]
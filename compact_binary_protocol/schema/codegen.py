@@ -0,0 +1,279 @@
+"""
+Generate Data* classes from a declarative schema.
+
+DataSchema.source() emits the Python source of a module defining a class shaped like the
+hand-written Data* classes (to_bytes, size_hint, write_into, from_payload, describe). Each run
+of consecutive fixed-size fields becomes one precompiled Struct, and the first run is fused
+with the item header, so a fixed-size item is a single pack_into call. build() compiles the
+source once; with ``cache_dir`` the source is written to a module there and imported, so
+later processes load it from its cached bytecode instead of compiling it again.
+"""
+import hashlib
+import importlib.util
+import linecache
+import os
+import struct
+import sys
+
+from ..decoders.registry import register_data_type
+from ..encodings.codec import ITEM_HEADER
+from .fields import Repeated, VarBytes, VarString, check_fields
+
+
+def _segments(fields):
+    """Split fields into ('fixed', [(name, field), ...]) runs and ('var', name, field) entries."""
+    segments = []
+    for name, field in fields:
+        if field.fixed:
+            if segments and segments[-1][0] == 'fixed':
+                segments[-1][1].append((name, field))
+            else:
+                segments.append(('fixed', [(name, field)]))
+        else:
+            segments.append(('var', name, field))
+    return segments
+
+
+class DataSchema:
+    """
+    Declarative layout of a Data item payload.
+
+    - name: class name of the generated Data class.
+    - sensor_type / sensor_version: the item's (type, version), both 0..255.
+    - fields: [(name, field), ...] with fields from schema.fields (u8, i16, Scaled(i16, 10),
+      VarString(), VarBytes(), Repeated([...]), ...), in wire order.
+    """
+
+    def __init__(self, name: str, sensor_type: int, sensor_version: int, fields):
+        if not name.isidentifier():
+            raise ValueError(f"Invalid class name {name!r}")
+        for label, value in (('sensor_type', sensor_type), ('sensor_version', sensor_version)):
+            if not 0 <= value <= 255:
+                raise ValueError(f"{label} must be 0..255, got {value}")
+        self.name = name
+        self.sensor_type = sensor_type
+        self.sensor_version = sensor_version
+        self.fields = check_fields(fields)
+
+    def source(self) -> str:
+        """Python source of a module defining the generated class."""
+        segments = _segments(self.fields)
+        names = [name for name, _ in self.fields]
+        var_fields = [(name, field) for name, field in self.fields if not field.fixed]
+        fixed_payload = sum(struct.calcsize('>' + ''.join(f.fmt for _, f in seg[1]))
+                            for seg in segments if seg[0] == 'fixed')
+        const_length = fixed_payload + len(var_fields)
+        first_fixed = segments[0][1] if segments[0][0] == 'fixed' else []
+        item_fmt = ITEM_HEADER.format + ''.join(f.fmt for _, f in first_fixed)
+        item_size = struct.calcsize(item_fmt)
+
+        out = [
+            f'# Generated by compact_binary_protocol.schema for {self.name}; do not edit.',
+            'import struct',
+            '',
+            'from compact_binary_protocol.encodings.codec import write_var_bytes',
+            '',
+            f'_ITEM = struct.Struct({item_fmt!r})',
+        ]
+        for i, seg in enumerate(segments):
+            if seg[0] == 'fixed':
+                fmt = '>' + ''.join(f.fmt for _, f in seg[1])
+                out.append(f'_P{i} = struct.Struct({fmt!r})')
+            elif isinstance(seg[2], Repeated):
+                out.append(f'_R{i} = [None] * 256')
+        for i, seg in enumerate(segments):
+            if seg[0] == 'var' and isinstance(seg[2], Repeated):
+                out += [
+                    '',
+                    '',
+                    f'def _r{i}(count):',
+                    f'    s = _R{i}[count]',
+                    '    if s is None:',
+                    f'        s = _R{i}[count] = struct.Struct(\'>\' + {seg[2].fmt!r} * count)',
+                    '    return s',
+                ]
+
+        out += [
+            '',
+            '',
+            f'class {self.name}:',
+            f'    """Data item type={self.sensor_type}, version={self.sensor_version} (generated from a schema)."""',
+            f'    __slots__ = {tuple(names)!r}',
+            f'    sensor_type = {self.sensor_type}',
+            f'    sensor_version = {self.sensor_version}',
+            '',
+            f'    def __init__(self, {", ".join(names)}):',
+        ]
+        out += [f'        self.{name} = {name}' for name in names]
+
+        # ---- size_hint ----
+        hint = [str(ITEM_HEADER.size + const_length)]
+        for name, field in var_fields:
+            per = f' * {struct.calcsize(">" + field.fmt)}' if isinstance(field, Repeated) else ''
+            hint.append(f'min(len(self.{name}), 255){per}')
+        out += ['', '    def size_hint(self):', f'        return {" + ".join(hint)}']
+
+        # ---- write_into ----
+        out += ['', '    def write_into(self, buf, offset=0):']
+        length = [str(const_length)]
+        for name, field in var_fields:
+            if isinstance(field, VarString):
+                out.append(f"        v_{name} = self.{name}.encode('ascii')[:255]")
+                length.append(f'len(v_{name})')
+            elif isinstance(field, VarBytes):
+                out.append(f'        v_{name} = bytes(self.{name}[:255])')
+                length.append(f'len(v_{name})')
+            else:
+                out.append(f'        v_{name} = self.{name}[:255]')
+                length.append(f'len(v_{name}) * {struct.calcsize(">" + field.fmt)}')
+        header_args = [str(self.sensor_type), str(self.sensor_version), ' + '.join(length)]
+        header_args += [field.encode_expr(f'self.{name}') for name, field in first_fixed]
+        out += [
+            f'        _ITEM.pack_into(buf, offset, {", ".join(header_args)})',
+            f'        offset += {item_size}',
+        ]
+        for i, seg in enumerate(segments):
+            if i == 0 and seg[0] == 'fixed':
+                continue
+            if seg[0] == 'fixed':
+                args = ', '.join(field.encode_expr(f'self.{name}') for name, field in seg[1])
+                size = struct.calcsize('>' + ''.join(f.fmt for _, f in seg[1]))
+                out += [f'        _P{i}.pack_into(buf, offset, {args})', f'        offset += {size}']
+                continue
+            _, name, field = seg
+            if not isinstance(field, Repeated):
+                out.append(f'        offset = write_var_bytes(buf, offset, v_{name})')
+                continue
+            group = [f.encode_expr(f'r[{j}]') for j, (_, f) in enumerate(field.fields)]
+            if len(group) == 1:
+                flat = f'[{group[0]} for r in v_{name}]'
+            else:
+                flat = f'[x for r in v_{name} for x in ({", ".join(group)})]'
+            out += [
+                f'        buf[offset] = len(v_{name})',
+                '        offset += 1',
+                f'        if v_{name}:',
+                f'            _r{i}(len(v_{name})).pack_into(buf, offset, *{flat})',
+                f'            offset += len(v_{name}) * {struct.calcsize(">" + field.fmt)}',
+            ]
+        out.append('        return offset')
+
+        # ---- to_bytes ----
+        out += ['', '    def to_bytes(self):']
+        if not var_fields:
+            out.append(f'        return _ITEM.pack({", ".join(header_args)})')
+        else:
+            out += [
+                '        buf = bytearray(self.size_hint())',
+                '        self.write_into(buf, 0)',
+                '        return bytes(buf)',
+            ]
+
+        # ---- from_payload ----
+        out += ['', '    @classmethod', '    def from_payload(cls, payload):']
+        if var_fields:
+            out.append('        end = len(payload)')
+        out.append('        offset = 0')
+        for i, seg in enumerate(segments):
+            if seg[0] == 'fixed':
+                targets = ', '.join(f'f_{name}' for name, _ in seg[1])
+                if len(seg[1]) == 1:
+                    targets += ','
+                size = struct.calcsize('>' + ''.join(f.fmt for _, f in seg[1]))
+                out.append(f'        {targets} = _P{i}.unpack_from(payload, offset)')
+                if i < len(segments) - 1:
+                    out.append(f'        offset += {size}')
+                continue
+            _, name, field = seg
+            out += ['        n = payload[offset]', '        offset += 1']
+            if isinstance(field, Repeated):
+                k = len(field.fields)
+                decoded = [f.decode_expr(f'x{j}') for j, (_, f) in enumerate(field.fields)]
+                if k == 1:
+                    comp = f'[({decoded[0]},) for x0 in flat]'
+                else:
+                    xs = ', '.join(f'x{j}' for j in range(k))
+                    slices = ', '.join(f'flat[{j}::{k}]' for j in range(k))
+                    comp = f'[({", ".join(decoded)}) for {xs} in zip({slices})]'
+                out += [
+                    f'        flat = _r{i}(n).unpack_from(payload, offset)',
+                    f'        offset += n * {struct.calcsize(">" + field.fmt)}',
+                    f'        f_{name} = {comp}',
+                ]
+                continue
+            value = f"str(payload[offset:offset + n], 'ascii')" if isinstance(field, VarString) \
+                else 'bytes(payload[offset:offset + n])'
+            out += [
+                '        if offset + n > end:',
+                f'            raise ValueError(f"Not enough data to read {name} of length {{n}}")',
+                f'        f_{name} = {value}',
+                '        offset += n',
+            ]
+        args = ', '.join(field.decode_expr(f'f_{name}') if field.fixed else f'f_{name}'
+                         for name, field in self.fields)
+        out.append(f'        return cls({args})')
+
+        # ---- describe ----
+        shown = ''.join(f', {name}={{self.{name}}}' for name in names)
+        out += [
+            '',
+            '    def describe(self):',
+            f'        return f"{self.name}(type={{self.sensor_type}}, ver={{self.sensor_version}}{shown})"',
+            '',
+        ]
+        return '\n'.join(out)
+
+    def build(self, cache_dir: str | None = None):
+        """
+        Compile the generated class and return it. With ``cache_dir``, the module is written
+        there once (named after a hash of its source) and imported from disk.
+        """
+        source = self.source()
+        if cache_dir is not None:
+            return getattr(_load_cached(cache_dir, self.name, source), self.name)
+        filename = f'<schema {self.name}>'
+        # Keep the source around so tracebacks show the generated lines
+        linecache.cache[filename] = (len(source), None, source.splitlines(True), filename)
+        namespace = {'__name__': 'compact_binary_protocol.schema.generated'}
+        exec(compile(source, filename, 'exec'), namespace)
+        return namespace[self.name]
+
+
+def _load_cached(cache_dir, name, source):
+    digest = hashlib.sha256(source.encode('utf-8')).hexdigest()[:16]
+    module_name = f'cbp_schema_{name}_{digest}'
+    module = sys.modules.get(module_name)
+    if module is not None:
+        return module
+    path = os.path.join(cache_dir, module_name + '.py')
+    if not os.path.exists(path):
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp = f'{path}.{os.getpid()}.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            f.write(source)
+        os.replace(tmp, path)
+    spec = importlib.util.spec_from_file_location(module_name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def define_data_type(name: str, sensor_type: int, sensor_version: int, fields, *,
+                     register: bool = True, cache_dir: str | None = None):
+    """
+    Generate a Data class from a schema and (by default) register it with the decoders.
+
+        DataPressure = define_data_type('DataPressure', 200, 1, [
+            ('pressure', Scaled(u16, 10)),
+            ('label', VarString()),
+            ('samples', Repeated([('temperature', Scaled(i16, 10)), ('humidity', u8)])),
+        ])
+    """
+    cls = DataSchema(name, sensor_type, sensor_version, fields).build(cache_dir)
+    if register:
+        register_data_type(sensor_type, sensor_version, cls)
+    return cls
+
+
+__all__ = ['DataSchema', 'define_data_type']
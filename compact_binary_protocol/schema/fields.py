@@ -0,0 +1,116 @@
+"""
+Field types for declarative Data item schemas.
+
+Fixed-size fields (u8, i16, Scaled(...), ...) map to one struct format character each, so
+consecutive fixed fields are packed with a single Struct. VarString, VarBytes and Repeated
+are variable-length and split the payload into runs.
+"""
+import keyword
+
+
+class Field:
+    """Fixed-size scalar: struct format character and optional fixed-point scale."""
+    __slots__ = ('fmt', 'scale')
+    fixed = True
+
+    def __init__(self, fmt: str, scale=None):
+        self.fmt = fmt
+        self.scale = scale
+
+    def encode_expr(self, ref: str) -> str:
+        if self.scale is None:
+            return ref
+        return f'round({ref} * {self.scale!r})'
+
+    def decode_expr(self, ref: str) -> str:
+        if self.scale is None:
+            return ref
+        return f'{ref} / {self.scale!r}'
+
+    def __repr__(self):
+        if self.scale is None:
+            return f'Field({self.fmt!r})'
+        return f'Field({self.fmt!r}, {self.scale!r})'
+
+
+u8 = Field('B')
+i8 = Field('b')
+u16 = Field('H')
+i16 = Field('h')
+u32 = Field('I')
+i32 = Field('i')
+f32 = Field('f')
+
+
+def Scaled(base: Field, scale) -> Field:
+    """
+    Fixed-point field: ``value * scale`` is stored as ``base`` (rounded), and decoded back
+    as ``stored / scale``. E.g. Scaled(i16, 10) holds tenths, like DataEnvironment.
+    """
+    if not isinstance(base, Field) or base.scale is not None:
+        raise ValueError(f"Scaled() needs an unscaled fixed field, got {base!r}")
+    return Field(base.fmt, scale)
+
+
+class VarString:
+    """VarString: len u8 + ASCII bytes (truncated to 255)."""
+    fixed = False
+
+    def __repr__(self):
+        return 'VarString()'
+
+
+class VarBytes:
+    """VarBytes: len u8 + raw bytes (truncated to 255)."""
+    fixed = False
+
+    def __repr__(self):
+        return 'VarBytes()'
+
+
+class Repeated:
+    """
+    Repeated group: count u8 followed by ``count`` records of fixed-size fields. Values are
+    lists of tuples in field order (at most 255 are encoded).
+    """
+    fixed = False
+
+    def __init__(self, fields):
+        self.fields = check_fields(fields)
+        for name, field in self.fields:
+            if not field.fixed:
+                raise ValueError(f"Repeated group field {name!r} must be fixed-size, got {field!r}")
+        self.fmt = ''.join(field.fmt for _, field in self.fields)
+
+    def __repr__(self):
+        return f'Repeated({self.fields!r})'
+
+
+# Names the generated class already uses: its class attributes, methods and ``self``
+RESERVED_NAMES = frozenset({
+    'self', 'sensor_type', 'sensor_version',
+    'size_hint', 'write_into', 'to_bytes', 'from_payload', 'describe',
+})
+
+
+def check_fields(fields):
+    """Validate a [(name, field), ...] list and return it as a tuple."""
+    fields = tuple((name, field) for name, field in fields)
+    if not fields:
+        raise ValueError("A schema needs at least one field")
+    seen = set()
+    for name, field in fields:
+        if not name.isidentifier() or keyword.iskeyword(name) or name.startswith('_'):
+            raise ValueError(f"Invalid field name {name!r}")
+        if name in RESERVED_NAMES:
+            raise ValueError(f"Reserved field name {name!r}")
+        if name in seen:
+            raise ValueError(f"Duplicate field name {name!r}")
+        if not isinstance(field, (Field, VarString, VarBytes, Repeated)):
+            raise ValueError(f"Unknown field type for {name!r}: {field!r}")
+        seen.add(name)
+    return fields
+
+
+__all__ = ['Field', 'u8', 'i8', 'u16', 'i16', 'u32', 'i32', 'f32', 'Scaled',
+           'VarString', 'VarBytes', 'Repeated']
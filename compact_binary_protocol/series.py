@@ -0,0 +1,209 @@
+"""
+Streaming expansion and windowed aggregation of DataMulti series.
+
+A DataMulti item carries ``first_timestamp``, ``interval`` and up to 255 temperature/humidity
+records; sample i was taken at first_timestamp + interval * i. iter_samples() expands the
+Multi items of decoded telemetry into (imei, ts, temperature, humidity) tuples straight from
+the record array. WindowAggregator downsamples the same series into fixed windows
+(e.g. 5 minutes) per device, keeping only running integer sums/min/max per open window.
+
+Out-of-order data: each device has a watermark, its newest sample time minus ``lateness``.
+A window is emitted once it ends at or before the watermark; samples for an emitted window
+arrive too late and are dropped (counted in ``late``). Memory is bounded by the open windows
+per device (about lateness / window + 2) times ``max_devices``; when more devices are active,
+the least recently updated device is flushed and forgotten.
+"""
+from collections import OrderedDict
+
+from .data import DataMulti
+
+
+def iter_samples(packets):
+    """
+    Yield (imei, ts, temperature, humidity) for every record of every DataMulti item in
+    ``packets`` (decoded TelemetryPackets or anything with ``device_id`` and ``data``).
+    Temperature is in °C and humidity in %, as floats.
+    """
+    for packet in packets:
+        imei = packet.device_id
+        for item in packet.data:
+            if type(item) is DataMulti:
+                ts = int(item.first_timestamp)
+                interval = int(item.interval)
+                values = item.record_values()
+                for temp, hum in zip(values[0::2], values[1::2]):
+                    yield imei, ts, temp / 10, hum / 10
+                    ts += interval
+
+
+class WindowStats:
+    """Aggregate of one device's samples in [start, start + window): count and min/max/mean per channel."""
+    __slots__ = ('imei', 'start', 'count', 'temperature_min', 'temperature_max', 'temperature_mean',
+                 'humidity_min', 'humidity_max', 'humidity_mean')
+
+    def __init__(self, imei, start, count, temperature_min, temperature_max, temperature_mean,
+                 humidity_min, humidity_max, humidity_mean):
+        self.imei = imei
+        self.start = start
+        self.count = count
+        self.temperature_min = temperature_min
+        self.temperature_max = temperature_max
+        self.temperature_mean = temperature_mean
+        self.humidity_min = humidity_min
+        self.humidity_max = humidity_max
+        self.humidity_mean = humidity_mean
+
+    def as_tuple(self):
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __repr__(self):
+        return (f"WindowStats(imei={self.imei}, start={self.start}, count={self.count}, "
+                f"temperature={self.temperature_min}/{self.temperature_mean:.2f}/{self.temperature_max}, "
+                f"humidity={self.humidity_min}/{self.humidity_mean:.2f}/{self.humidity_max})")
+
+
+class _Device:
+    __slots__ = ('latest', 'closed', 'windows')
+
+    def __init__(self):
+        self.latest = None
+        self.closed = None  # windows starting before this have been emitted
+        self.windows = {}  # start -> [count, t_sum, t_min, t_max, h_sum, h_min, h_max] in tenths
+
+
+class WindowAggregator:
+    """
+    Per-device tumbling-window min/max/mean of DataMulti temperature and humidity.
+
+    ``window`` and ``lateness`` are in seconds (lateness defaults to one window). Feed it with
+    process(packets), which yields WindowStats as windows close, or call add_multi() directly
+    and collect the returned lists. Call advance(now) periodically to close the windows of
+    devices that stopped reporting, and flush() at the end of a stream.
+    """
+    def __init__(self, window: int = 300, lateness: int | None = None, max_devices: int = 100000):
+        if window <= 0:
+            raise ValueError("window must be positive")
+        self.window = window
+        self.lateness = window if lateness is None else lateness
+        self.max_devices = max_devices
+        self._devices = OrderedDict()
+        self.samples = 0
+        self.late = 0
+        self.evicted = 0
+
+    def add_multi(self, imei, multi) -> list:
+        """Aggregate the records of one DataMulti from device ``imei``; returns the windows it closed."""
+        values = multi.record_values()
+        n = len(values) // 2
+        if n == 0:
+            return []
+        emitted = []
+        device = self._device(imei, emitted)
+        first = int(multi.first_timestamp)
+        interval = int(multi.interval)
+        window = self.window
+        windows = device.windows
+        closed = device.closed
+        temps = values[0::2]
+        hums = values[1::2]
+        i = 0
+        while i < n:
+            ts = first + interval * i
+            start = ts - ts % window
+            # Records are evenly spaced, so the window's slice ends at a computable index
+            j = min(n, i + -(-(start + window - ts) // interval)) if interval > 0 else n
+            if closed is not None and start < closed:
+                self.late += j - i
+                i = j
+                continue
+            t = temps[i:j]
+            h = hums[i:j]
+            acc = windows.get(start)
+            if acc is None:
+                windows[start] = [j - i, sum(t), min(t), max(t), sum(h), min(h), max(h)]
+            else:
+                acc[0] += j - i
+                acc[1] += sum(t)
+                acc[2] = min(acc[2], min(t))
+                acc[3] = max(acc[3], max(t))
+                acc[4] += sum(h)
+                acc[5] = min(acc[5], min(h))
+                acc[6] = max(acc[6], max(h))
+            i = j
+        self.samples += n
+        last = first + interval * (n - 1) if interval > 0 else first
+        if device.latest is None or last > device.latest:
+            device.latest = last
+        self._close(imei, device, device.latest - self.lateness, emitted)
+        return emitted
+
+    def process(self, packets):
+        """Consume decoded telemetry and yield WindowStats as windows close, then the remaining ones."""
+        for packet in packets:
+            for item in packet.data:
+                if type(item) is DataMulti:
+                    yield from self.add_multi(packet.device_id, item)
+        yield from self.flush()
+
+    def advance(self, now: int) -> list:
+        """Close every window that ended at or before ``now - lateness`` (e.g. wall-clock time)."""
+        emitted = []
+        watermark = now - self.lateness
+        for imei, device in self._devices.items():
+            self._close(imei, device, watermark, emitted)
+        return emitted
+
+    def flush(self, imei=None) -> list:
+        """Emit all open windows (of one device, or of all) and forget the device(s)."""
+        emitted = []
+        if imei is None:
+            while self._devices:
+                key, device = self._devices.popitem(last=False)
+                self._emit_all(key, device, emitted)
+        else:
+            device = self._devices.pop(imei, None)
+            if device is not None:
+                self._emit_all(imei, device, emitted)
+        return emitted
+
+    def stats(self) -> dict:
+        return {'devices': len(self._devices), 'open_windows': sum(len(d.windows) for d in self._devices.values()),
+                'samples': self.samples, 'late': self.late, 'evicted': self.evicted}
+
+    # ---- internals ----
+    def _device(self, imei, emitted):
+        devices = self._devices
+        device = devices.get(imei)
+        if device is None:
+            device = devices[imei] = _Device()
+            if len(devices) > self.max_devices:
+                key, oldest = devices.popitem(last=False)
+                self.evicted += 1
+                self._emit_all(key, oldest, emitted)
+        else:
+            devices.move_to_end(imei)
+        return device
+
+    def _close(self, imei, device, watermark, emitted):
+        boundary = watermark - watermark % self.window
+        if device.closed is not None and boundary <= device.closed:
+            return
+        device.closed = boundary
+        windows = device.windows
+        for start in sorted(s for s in windows if s < boundary):
+            emitted.append(self._stats(imei, start, windows.pop(start)))
+
+    def _emit_all(self, imei, device, emitted):
+        windows = device.windows
+        for start in sorted(windows):
+            emitted.append(self._stats(imei, start, windows[start]))
+        windows.clear()
+
+    @staticmethod
+    def _stats(imei, start, acc):
+        count, t_sum, t_min, t_max, h_sum, h_min, h_max = acc
+        return WindowStats(imei, start, count, t_min / 10, t_max / 10, t_sum / count / 10,
+                           h_min / 10, h_max / 10, h_sum / count / 10)
+
+
+__all__ = ['iter_samples', 'WindowAggregator', 'WindowStats']
@@ -0,0 +1,5 @@
+from .udp import CompactBinaryServer, ServerStats, DEFAULT_ACK_COMMANDS
+from .batched import BatchedCompactBinaryServer
+from .multiproc import MultiProcessServer
+
+__all__ = ['CompactBinaryServer', 'BatchedCompactBinaryServer', 'ServerStats', 'DEFAULT_ACK_COMMANDS', 'MultiProcessServer']
@@ -0,0 +1,181 @@
+"""
+Multi-core ingest: N worker processes sharing one UDP port via SO_REUSEPORT.
+
+Each worker runs a CompactBinaryServer (decode + Ack) and forwards decoded packets to the
+parent in batches over a multiprocessing queue. The kernel spreads datagrams across the
+workers by source address, so throughput scales with cores when traffic comes from many
+devices. When the parent falls behind, the result queue fills, the workers' handlers
+block and their servers stop acking, which makes devices retry later.
+"""
+import asyncio
+import multiprocessing
+import os
+import queue
+import socket
+import time
+
+from .udp import CompactBinaryServer, DEFAULT_ACK_COMMANDS
+
+_MSG_BATCH = 'batch'
+_MSG_STATS = 'stats'
+
+
+async def _run_worker(host, port, out, stop, ready, batch_size, flush_interval, queue_size, ack_commands,
+                      server_class, server_options):
+    batch = []
+
+    async def flush():
+        nonlocal batch
+        if not batch:
+            return
+        pending, batch = batch, []
+        while True:
+            try:
+                out.put_nowait((_MSG_BATCH, pending))
+                return
+            except queue.Full:
+                await asyncio.sleep(flush_interval)
+
+    async def handler(packet, addr):
+        batch.append((packet, addr))
+        if len(batch) >= batch_size:
+            await flush()
+
+    server = server_class(handler, host=host, port=port, queue_size=queue_size,
+                          ack_commands=ack_commands, reuse_port=True, **server_options)
+    async with server:
+        ready.put(os.getpid())
+        while not stop.is_set():
+            await asyncio.sleep(flush_interval)
+            await flush()
+        server.stop_receiving()
+        await server.queue.join()
+        await flush()
+    out.put((_MSG_STATS, os.getpid(), server.stats.as_dict()))
+
+
+def _worker_main(*args):
+    asyncio.run(_run_worker(*args))
+
+
+class MultiProcessServer:
+    """
+    Spawn ``processes`` workers bound to the same (host, port) with SO_REUSEPORT.
+
+    Decoded packets arrive in the parent as batches of ``(packet, addr)`` tuples:
+
+        with MultiProcessServer(port=10106, processes=4) as server:
+            while True:
+                for packet, addr in server.get_batch():
+                    ...
+
+    - batch_size / flush_interval: a worker forwards its batch when it holds batch_size
+      packets or every flush_interval seconds, whichever comes first.
+    - queue_size: bound of each worker's pending-packet queue (see CompactBinaryServer).
+    - result_queue_size: bound (in batches) of the worker → parent queue.
+    - start_method: multiprocessing start method ('fork', 'spawn', ...); platform default if None.
+    - server_class / server_options: server run in each worker and its extra keyword arguments,
+      e.g. ``server_class=BatchedCompactBinaryServer, server_options={'batch_size': 128}``.
+
+    With port=0 a free port is picked and exposed as ``server.port`` after start().
+    """
+    def __init__(self, host='0.0.0.0', port=10106, processes=None, *, batch_size=256, flush_interval=0.05,
+                 queue_size=10000, result_queue_size=1024, ack_commands=DEFAULT_ACK_COMMANDS, start_method=None,
+                 server_class=CompactBinaryServer, server_options=None):
+        if not hasattr(socket, 'SO_REUSEPORT'):
+            raise OSError("SO_REUSEPORT is not supported on this platform")
+        self.host = host
+        self.port = port
+        self.processes = processes or os.cpu_count() or 1
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.queue_size = queue_size
+        self.ack_commands = frozenset(ack_commands)
+        self.server_class = server_class
+        self.server_options = dict(server_options or {})
+        self._ctx = multiprocessing.get_context(start_method)
+        self._results = self._ctx.Queue(maxsize=result_queue_size)
+        self._stop = self._ctx.Event()
+        self._workers = []
+        self.worker_stats = {}
+
+    def start(self, timeout=10.0):
+        if self.port == 0:
+            # Pick a free port for all workers to share. The probe is closed before forking:
+            # a forked worker would otherwise inherit it and the kernel would route part of
+            # the traffic to a socket nobody reads.
+            with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as probe:
+                probe.bind((self.host, 0))
+                self.port = probe.getsockname()[1]
+        ready = self._ctx.Queue()
+        try:
+            for _ in range(self.processes):
+                proc = self._ctx.Process(
+                    target=_worker_main,
+                    args=(self.host, self.port, self._results, self._stop, ready, self.batch_size,
+                          self.flush_interval, self.queue_size, self.ack_commands,
+                          self.server_class, self.server_options),
+                    daemon=True,
+                )
+                proc.start()
+                self._workers.append(proc)
+            for _ in range(self.processes):
+                ready.get(timeout=timeout)
+        except BaseException:
+            self.stop()
+            raise
+        return self
+
+    def _handle(self, msg):
+        if msg[0] == _MSG_STATS:
+            self.worker_stats[msg[1]] = msg[2]
+            return None
+        return msg[1]
+
+    def get_batch(self, timeout=None):
+        """Return the next batch of (packet, addr) tuples, or [] if none arrived within ``timeout``."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                msg = self._results.get(timeout=remaining)
+            except queue.Empty:
+                return []
+            batch = self._handle(msg)
+            if batch is not None:
+                return batch
+
+    def stop(self, timeout=5.0):
+        """
+        Stop the workers and return the batches they still delivered while shutting down.
+        Per-worker counters are collected into ``worker_stats`` (keyed by pid).
+        """
+        self._stop.set()
+        leftover = []
+        deadline = time.monotonic() + timeout
+        while any(p.is_alive() for p in self._workers) and time.monotonic() < deadline:
+            try:
+                batch = self._handle(self._results.get(timeout=0.05))
+            except queue.Empty:
+                continue
+            if batch is not None:
+                leftover.append(batch)
+        while True:
+            try:
+                batch = self._handle(self._results.get_nowait())
+            except queue.Empty:
+                break
+            if batch is not None:
+                leftover.append(batch)
+        for proc in self._workers:
+            proc.join(timeout=max(0.0, deadline - time.monotonic()))
+            if proc.is_alive():
+                proc.terminate()
+        self._workers = []
+        return leftover
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
@@ -0,0 +1,172 @@
+"""
+asyncio UDP server for the compact binary protocol.
+
+Each datagram is decoded with decode_packet(), acknowledged with a header-only Ack when
+its command requires one (built straight from the incoming header, see decoders.header), and queued for an async handler. The queue is bounded: when
+it is full the packet is dropped *without* an Ack, so the device retransmits later
+instead of the server buffering without limit.
+"""
+import asyncio
+import logging
+
+from ..decoders import decode_packet, parse_header, build_ack, InvalidPacket
+
+logger = logging.getLogger(__name__)
+
+# Commands acknowledged by the server (see protocol.md, "Acknowledge")
+DEFAULT_ACK_COMMANDS = frozenset({'T\0', 'C\0', 'P+'})
+
+
+class ServerStats:
+    """Counters maintained by CompactBinaryServer."""
+    __slots__ = ('received', 'acked', 'malformed', 'dropped', 'handled', 'handler_errors',
+                 'recv_batches', 'ack_flushes')
+
+    def __init__(self):
+        self.received = 0
+        self.acked = 0
+        self.malformed = 0
+        self.dropped = 0
+        self.handled = 0
+        self.handler_errors = 0
+        self.recv_batches = 0
+        self.ack_flushes = 0
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class _ServerProtocol(asyncio.DatagramProtocol):
+    def __init__(self, server):
+        self.server = server
+
+    def connection_made(self, transport):
+        self.server.transport = transport
+
+    def datagram_received(self, data, addr):
+        self.server.datagram_received(data, addr)
+
+    def error_received(self, exc):
+        logger.warning("UDP error: %s", exc)
+
+
+class CompactBinaryServer:
+    """
+    UDP server that decodes packets, sends Acks and hands packets to ``handler``.
+
+    - handler: ``async def handler(packet, addr)``; when None, consume ``server.queue``
+      yourself (items are ``(packet, addr)`` tuples).
+    - queue_size: bound of the pending-packet queue (backpressure, see module docstring).
+    - workers: number of concurrent handler tasks.
+    - ack_commands: commands that are acknowledged.
+    - reuse_port: bind with SO_REUSEPORT so several processes can share the port.
+    - capture: optional object with ``write(data, addr)`` (e.g. capture.CaptureWriter) that
+      receives every inbound datagram before it is decoded.
+    - decoder: callable turning a datagram into the object queued for the handler. Pass
+      ``lambda data: PacketView(bytes(data))`` to route on the header without decoding
+      bodies; the decoder must not keep a reference to ``data`` itself, which may be a
+      reused buffer. A decoder may return a decoders.InvalidPacket instead of raising ValueError
+      (e.g. ``ValidatingDecoder().decode``); either counts as malformed.
+
+    Usage:
+        async with CompactBinaryServer(handler, port=10106) as server:
+            await server.serve_forever()
+    """
+    def __init__(self, handler=None, *, host='0.0.0.0', port=10106, queue_size=10000, workers=1,
+                 ack_commands=DEFAULT_ACK_COMMANDS, reuse_port=False, capture=None,
+                 decoder=decode_packet):
+        self.handler = handler
+        self.decoder = decoder
+        self.host = host
+        self.port = port
+        self.workers = workers
+        self.ack_commands = frozenset(ack_commands)
+        self.reuse_port = reuse_port
+        self.capture = capture
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self.stats = ServerStats()
+        self.transport = None
+        self._tasks = []
+        self._closed = None
+
+    # ---- Lifecycle ----
+    async def start(self):
+        loop = asyncio.get_running_loop()
+        self._closed = loop.create_future()
+        await loop.create_datagram_endpoint(lambda: _ServerProtocol(self), local_addr=(self.host, self.port),
+                                            reuse_port=self.reuse_port or None)
+        if self.handler is not None:
+            self._tasks = [loop.create_task(self._worker()) for _ in range(self.workers)]
+        return self
+
+    @property
+    def local_address(self):
+        return self.transport.get_extra_info('sockname') if self.transport is not None else None
+
+    async def serve_forever(self):
+        await self._closed
+
+    def stop_receiving(self):
+        """Close the socket but let the handler workers finish the queued packets."""
+        if self.transport is not None:
+            self.transport.close()
+
+    def close(self):
+        self.stop_receiving()
+        for task in self._tasks:
+            task.cancel()
+        if self._closed is not None and not self._closed.done():
+            self._closed.set_result(None)
+
+    async def wait_closed(self):
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.close()
+        await self.wait_closed()
+
+    # ---- Datagram path ----
+    def datagram_received(self, data, addr):
+        stats = self.stats
+        stats.received += 1
+        if self.capture is not None:
+            self.capture.write(data, addr)
+        try:
+            packet = self.decoder(data)
+            if type(packet) is InvalidPacket:
+                stats.malformed += 1
+                return
+            header = parse_header(data)
+        except ValueError:
+            stats.malformed += 1
+            return
+        try:
+            self.queue.put_nowait((packet, addr))
+        except asyncio.QueueFull:
+            # Not acked: the device will retry once the server has caught up
+            stats.dropped += 1
+            return
+        if header[1] in self.ack_commands:
+            self.send_ack(header, addr)
+
+    def send_ack(self, header, addr):
+        """Ack the packet whose parse_header() tuple is ``header``."""
+        self.transport.sendto(build_ack(header), addr)
+        self.stats.acked += 1
+
+    async def _worker(self):
+        queue = self.queue
+        while True:
+            packet, addr = await queue.get()
+            try:
+                await self.handler(packet, addr)
+                self.stats.handled += 1
+            except Exception:
+                self.stats.handler_errors += 1
+                logger.exception("Packet handler failed for %s", addr)
+            finally:
+                queue.task_done()
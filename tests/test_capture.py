@@ -0,0 +1,22 @@
+from compact_binary_protocol.capture import CaptureWriter, iter_capture, read_index, seek_offset
+
+
+def _write(tmp_path, timestamps):
+    with CaptureWriter(str(tmp_path), index_interval=1) as writer:
+        for i, ts in enumerate(timestamps):
+            writer.write(bytes([i]), timestamp=ts)
+    return writer.segments[0]
+
+
+def test_seek_offset_in_order(tmp_path):
+    path = _write(tmp_path, [100.0, 101.0, 102.0, 103.0])
+    records = list(iter_capture(path, seek_offset(read_index(path), 102.0)))
+    assert [r.timestamp for r in records] == [102.0, 103.0]
+
+
+def test_seek_offset_does_not_skip_out_of_order_records(tmp_path):
+    timestamps = [100.0, 105.0, 101.0, 106.0, 102.0]
+    path = _write(tmp_path, timestamps)
+    records = list(iter_capture(path, seek_offset(read_index(path), 101.5)))
+    wanted = [ts for ts in timestamps if ts >= 101.5]
+    assert all(ts in [r.timestamp for r in records] for ts in wanted)
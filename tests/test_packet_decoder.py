@@ -0,0 +1,33 @@
+import pytest
+
+from compact_binary_protocol import ConfigPacket, DataKv, decode_packet
+from compact_binary_protocol.decoders import InvalidPacket, ValidatingDecoder
+
+IMEI = '358419511056392'
+PAIRS = [('server', 'udp-us.tartabit.com:10106'), ('interval', '60'), ('readings', '5')]
+
+
+def _item_reply(pairs, transaction_id=3):
+    """A device C reply as ConfigPacket.decode expects it: [count][DataKv item]."""
+    header = ConfigPacket(IMEI, (), transaction_id).to_bytes()[:-1]
+    return header + b'\x01' + DataKv(pairs).to_bytes()
+
+
+@pytest.mark.parametrize('wire', [
+    ConfigPacket(IMEI, PAIRS, 3).to_bytes(),
+    _item_reply(PAIRS),
+], ids=['raw-kv', 'datakv-item'])
+def test_config_body_shapes_round_trip(wire):
+    packet = decode_packet(wire)
+    assert isinstance(packet, ConfigPacket)
+    assert packet.pairs == PAIRS
+    assert packet.transaction_id == 3
+    validated = ValidatingDecoder().decode(wire)
+    assert not isinstance(validated, InvalidPacket)
+    assert validated.pairs == PAIRS
+
+
+def test_item_reply_matches_config_packet_decode():
+    wire = _item_reply(PAIRS)
+    body = wire[len(ConfigPacket(IMEI, (), 3).to_bytes()) - 1:]
+    assert decode_packet(wire).pairs == ConfigPacket.decode(IMEI, 3, body).pairs
@@ -0,0 +1,15 @@
+import pytest
+
+from compact_binary_protocol.schema import define_data_type
+from compact_binary_protocol.schema.fields import u8, RESERVED_NAMES
+
+
+@pytest.mark.parametrize('name', sorted(RESERVED_NAMES))
+def test_reserved_field_names_are_rejected(name):
+    with pytest.raises(ValueError, match='Reserved field name'):
+        define_data_type('DataReserved', 200, 1, [(name, u8)])
+
+
+def test_duplicate_field_name_is_rejected():
+    with pytest.raises(ValueError, match='Duplicate field name'):
+        define_data_type('DataDuplicate', 200, 1, [('level', u8), ('level', u8)])
@@ -0,0 +1,59 @@
+import pytest
+
+from compact_binary_protocol import ConfigPacket, DataCustomerId, DataKv, TelemetryPacket, decode_packet
+from compact_binary_protocol.decoders import DataReader, InvalidPacket, ValidatingDecoder
+from compact_binary_protocol.decoders.validate import E_ENCODING, E_MISSING_COUNT
+
+IMEI = '358419511056392'
+
+
+def test_config_with_long_value_matches_decode_packet():
+    # A 130-byte value has a length byte >= 0x80, which is not itself ASCII
+    wire = ConfigPacket(IMEI, {'server': 'x' * 130, 'interval': '60'}, 7, 'W').to_bytes()
+    packet = ValidatingDecoder().decode(wire)
+    assert not isinstance(packet, InvalidPacket)
+    assert packet.pairs == decode_packet(wire).pairs
+    assert packet.to_bytes() == wire
+
+
+def test_config_with_non_ascii_string_is_invalid():
+    wire = bytearray(ConfigPacket(IMEI, {'mode': 'eco'}, 7, 'W').to_bytes())
+    wire[-1] = 0xFF
+    decoder = ValidatingDecoder()
+    packet = decoder.decode(bytes(wire))
+    assert isinstance(packet, InvalidPacket)
+    assert packet.code == E_ENCODING
+    assert decoder.stats()['encoding'] == 1
+
+
+def test_header_only_config_request_matches_decode_packet():
+    wire = ConfigPacket(IMEI, (), 9, 'C').to_bytes()
+    wire = wire[:-1]  # drop the count byte: per protocol.md the request body is empty
+    expected = decode_packet(wire)
+    packet = ValidatingDecoder().decode(wire)
+    assert isinstance(packet, ConfigPacket)
+    assert packet.pairs == expected.pairs == []
+    assert (packet.transaction_id, packet.timestamp) == (expected.transaction_id, expected.timestamp)
+
+
+def test_header_only_config_write_is_invalid():
+    wire = ConfigPacket(IMEI, (), 9, 'W').to_bytes()[:-1]
+    packet = ValidatingDecoder().decode(wire)
+    assert isinstance(packet, InvalidPacket)
+    assert packet.code == E_MISSING_COUNT
+
+
+def test_non_ascii_kv_item_in_telemetry_is_encoding_error():
+    wire = bytearray(TelemetryPacket(IMEI, 1700000000, 4, 'T', [DataKv({'mode': 'eco'})]).to_bytes())
+    wire[-1] = 0xE9
+    packet = ValidatingDecoder().decode(bytes(wire))
+    assert isinstance(packet, InvalidPacket)
+    assert packet.code == E_ENCODING
+
+
+def test_lenient_defaults_are_kept():
+    truncated = b'\x02\x01a\x01b\x01c'
+    assert DataReader.parse_kv_payload(truncated) == [('a', 'b')]
+    with pytest.raises(ValueError):
+        DataReader.parse_kv_payload(truncated, strict=True)
+    assert DataCustomerId('not hex').to_bytes() == DataCustomerId(b'').to_bytes()